@@ -0,0 +1,319 @@
+"""
+End-to-end benchmark for LinkedInScraper against local stand-ins.
+
+Serves recorded (or synthetic) search result pages and a fake Scrapingdog endpoint
+from a local HTTP server, swaps MongoDB for an in-memory writer (or a local mongod
+via --mongo-uri), drives LinkedInScraper.run and writes throughput, per-stage
+latency percentiles and peak RSS as JSON so runs can be compared across versions.
+
+    python benchmark.py --pages 10 --api-latency-ms 400 --api-error-rate 0.05
+    python benchmark.py --pages-dir recorded_pages/ --output bench.json
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+
+from linkedin_scrap import EnrichmentCache, LinkedInScraper, MongoWriter, ScraperConfig, metrics
+
+# Scraper methods timed as benchmark stages
+STAGES = [
+    'ensure_logged_in',
+    'search_role',
+    '_navigate',
+    '_wait_for_results',
+    'scrape_profiles_on_page',
+    'go_to_next_page',
+    'resolve_enrichment',
+    'flush_results',
+    'linkedin_scraping_dog',
+]
+
+PAGE_TEMPLATE = """<html><head><title>{title}</title></head><body>
+<div class="global-nav__me">me</div>
+{body}
+</body></html>"""
+
+
+def synthetic_results_page(page, pages, profiles_per_page, keywords):
+    """Search results page shaped like LinkedIn's people results"""
+    if page > pages:
+        return PAGE_TEMPLATE.format(title="Search", body="<p>No more results</p>")
+    items = []
+    for i in range(profiles_per_page):
+        profile_id = f"bench-p{page}-{i}"
+        items.append(
+            f'<li class="reusable-search__result-container"><a href="/in/{profile_id}/?miniProfileUrn=x">'
+            f'<span dir="ltr"><span aria-hidden="true">Candidate {page}-{i}</span>'
+            f'<span class="visually-hidden">View Candidate {page}-{i}\'s profile</span></span></a></li>'
+        )
+    next_url = f"/search/results/people/?keywords={quote(keywords)}&page={page + 1}"
+    if page < pages:
+        next_button = f'<button aria-label="Next" onclick="location.href=\'{next_url}\'">Next</button>'
+    else:
+        next_button = '<button aria-label="Next" disabled>Next</button>'
+    body = (
+        '<button type="button" aria-label="People">People</button>'
+        '<div class="search-results__cluster"><ul>' + ''.join(items) + '</ul></div>' + next_button
+    )
+    return PAGE_TEMPLATE.format(title="Search", body=body)
+
+
+def fake_profile(profile_id):
+    """Scrapingdog-shaped profile payload"""
+    return [{
+        'public_identifier': profile_id,
+        'fullName': profile_id.replace('-', ' ').title(),
+        'headline': 'Senior Software Engineer | Python | AWS',
+        'location': 'Austin, Texas, United States',
+        'about': 'Builds distributed systems. ' * 20,
+        'experience': [
+            {'position': 'Senior Software Engineer', 'company_name': f'Company {i}',
+             'starts_at': f'Jan {2012 + 2 * i}', 'ends_at': f'Dec {2013 + 2 * i}' if i < 3 else 'Present',
+             'summary': 'Worked on backend services. ' * 10}
+            for i in range(4)
+        ],
+        'education': [{'college_name': 'State University', 'college_degree': 'BS', 'college_degree_field': 'CS'}],
+        'skills': ['Python', 'Docker', 'Kubernetes', 'AWS', 'PostgreSQL'],
+    }]
+
+
+def make_handler(args, recorded_pages):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *a):
+            pass
+
+        def _send(self, status, body, content_type='text/html', headers=None):
+            data = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if url.path.startswith('/scrapingdog'):
+                return self._scrapingdog(query)
+            if url.path == '/login':
+                body = ('<form action="/feed/" method="get"><input id="username"><input id="password" type="password">'
+                        '<button type="submit">Sign in</button></form>')
+                return self._send(200, PAGE_TEMPLATE.format(title="Login", body=body).replace(
+                    '<div class="global-nav__me">me</div>', ''))
+            if url.path == '/search/results/all/':
+                body = ('<form action="/search/results/people/" method="get">'
+                        '<input class="search-global-typeahead__input" name="keywords"></form>')
+                return self._send(200, PAGE_TEMPLATE.format(title="Search", body=body))
+            if url.path.startswith('/search/results/people'):
+                page = int(query.get('page', ['1'])[0])
+                keywords = query.get('keywords', [''])[0]
+                if recorded_pages:
+                    if page <= len(recorded_pages):
+                        with open(recorded_pages[page - 1], encoding='utf-8') as f:
+                            return self._send(200, f.read())
+                    return self._send(200, PAGE_TEMPLATE.format(title="Search", body="<p>No more results</p>"))
+                return self._send(200, synthetic_results_page(page, args.pages, args.profiles_per_page, keywords))
+            return self._send(200, PAGE_TEMPLATE.format(title="Feed", body="<p>feed</p>"))
+
+        def _scrapingdog(self, query):
+            latency = max(0.0, random.gauss(args.api_latency_ms, args.api_latency_ms * 0.25)) / 1000
+            time.sleep(latency)
+            if random.random() < args.api_error_rate:
+                status = random.choice([429, 500, 503])
+                return self._send(status, '{"error": "injected"}', 'application/json', {'Retry-After': '0'})
+            profile_id = query.get('linkId', ['unknown'])[0]
+            return self._send(200, json.dumps(fake_profile(profile_id)), 'application/json')
+
+    return Handler
+
+
+class InMemoryMongoWriter(MongoWriter):
+    """MongoWriter stand-in that keeps upserted documents in a dict"""
+
+    uri = None
+    collection = None
+
+    def __init__(self, batch_size=100):
+        self.client = None
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self.documents = {}
+
+    def _bulk_upsert(self, batch):
+        for record in batch:
+            self.documents[record['profile_url']] = record
+
+    def close(self):
+        self.flush()
+
+
+def check_enrichment_cache(workdir):
+    """Fail fast unless a list-shaped Scrapingdog payload round-trips through the enrichment cache"""
+    cache = EnrichmentCache(os.path.join(workdir, 'cache_check.sqlite'))
+    try:
+        payload = fake_profile('roundtrip-check')
+        cache.put('https://www.linkedin.com/in/Roundtrip-Check/', payload)
+        if cache.get('roundtrip-check') != payload:
+            raise SystemExit("Enrichment cache did not round-trip a Scrapingdog list payload")
+    finally:
+        cache.close()
+
+
+def time_stages(scraper, timings):
+    """Wrap the scraper's stage methods so every call records its duration"""
+    for name in STAGES:
+        original = getattr(scraper, name)
+
+        def timed(*a, _original=original, _name=name, **kw):
+            start = time.perf_counter()
+            try:
+                return _original(*a, **kw)
+            finally:
+                timings[_name].append(time.perf_counter() - start)
+
+        setattr(scraper, name, timed)
+    # The enrichment pool captured the unwrapped bound method at construction
+    scraper.enrichment_pool.fetch = scraper.linkedin_scraping_dog
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(q / 100 * (len(values) - 1)))))
+    return values[index]
+
+
+def peak_rss_mb():
+    """Peak RSS of this process and of its reaped children (Chrome, chromedriver), in MB"""
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    # ru_maxrss is KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale)
+
+
+def git_version():
+    try:
+        # The benchmark runs from a temp dir, so describe the checkout this script lives in
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=5, help='synthetic result pages to serve')
+    parser.add_argument('--profiles-per-page', type=int, default=10)
+    parser.add_argument('--pages-dir', help='directory of recorded result pages (page-1.html, page-2.html, ...)')
+    parser.add_argument('--api-latency-ms', type=float, default=300, help='mean fake Scrapingdog latency')
+    parser.add_argument('--api-error-rate', type=float, default=0.0, help='fraction of 429/5xx responses')
+    parser.add_argument('--mongo-uri', help='use a real (local) MongoDB instead of the in-memory writer')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    recorded_pages = None
+    if args.pages_dir:
+        recorded_pages = sorted(glob.glob(os.path.join(args.pages_dir, 'page-*.html')),
+                                key=lambda p: int(os.path.basename(p)[5:-5]))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args, recorded_pages))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    output = os.path.abspath(args.output)
+    workdir = tempfile.mkdtemp(prefix='linkedin_bench_')
+    os.chdir(workdir)
+    check_enrichment_cache(workdir)
+
+    if args.mongo_uri:
+        mongo_writer = MongoWriter(args.mongo_uri, db_name='flexon_benchmark')
+        mongo_writer.collection.delete_many({})
+    else:
+        mongo_writer = InMemoryMongoWriter()
+
+    timings = defaultdict(list)
+    # Built explicitly rather than from the environment or a .env file, so stray settings cannot
+    # point the run at real services or change what is measured
+    config = ScraperConfig(
+        username='bench@example.com',
+        password='bench',
+        role='Software Engineer',
+        skills=['Python', 'Docker'],
+        scraping_dog_api_key='bench',
+        linkedin_base_url=base_url,
+        scraping_dog_url=f"{base_url}/scrapingdog/linkedin",
+        max_pages=0,
+        min_page_interval=0.0,
+        page_interval_jitter=0.0,
+        reuse_session=False,
+        dedup_scope='run',
+        result_sinks=['mongo', 'jsonl'],
+    )
+    scraper = LinkedInScraper(os.path.join(workdir, 'linkedin_data.xlsx'), mongo_writer=mongo_writer,
+                              config=config)
+    # Keep the run offline and reproducible: no LLM call for the search query
+    scraper.build_people_search_query = lambda role: f'"{role}"'
+    time_stages(scraper, timings)
+
+    start = time.perf_counter()
+    scraper.run()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    if args.mongo_uri:
+        stored = mongo_writer.collection.count_documents({})
+        mongo_writer.close()
+    else:
+        stored = len(mongo_writer.documents)
+    pages = len(timings['scrape_profiles_on_page'])
+    rss_self, rss_children = peak_rss_mb()
+    report = {
+        'version': git_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': vars(args),
+        'elapsed_seconds': elapsed,
+        'pages': pages,
+        'profiles_stored': stored,
+        'pages_per_minute': pages / elapsed * 60 if elapsed else None,
+        'profiles_per_minute': stored / elapsed * 60 if elapsed else None,
+        'stages': {
+            name: {
+                'calls': len(values),
+                'total_seconds': sum(values),
+                'p50_seconds': percentile(values, 50),
+                'p95_seconds': percentile(values, 95),
+            }
+            for name, values in timings.items()
+        },
+        'peak_rss_mb': {'scraper': rss_self, 'children': rss_children},
+        'scraper_metrics': metrics.snapshot(),
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Benchmark results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
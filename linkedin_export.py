@@ -0,0 +1,136 @@
+import re
+from datetime import date
+
+# Flattened export schema: column name and type. List columns hold strings.
+PROFILE_SCHEMA = [
+    ('name', 'string'),
+    ('profile_url', 'string'),
+    ('public_identifier', 'string'),
+    ('full_name', 'string'),
+    ('headline', 'string'),
+    ('location', 'string'),
+    ('country', 'string'),
+    ('about', 'string'),
+    ('current_title', 'string'),
+    ('current_company', 'string'),
+    ('experience_count', 'int'),
+    ('experience_years', 'float'),
+    ('titles', 'list'),
+    ('companies', 'list'),
+    ('skills', 'list'),
+    ('education', 'list'),
+    ('enriched', 'bool'),
+    ('score', 'float'),
+]
+
+PROFILE_COLUMNS = [name for name, _ in PROFILE_SCHEMA]
+
+MONTHS = {month: i for i, month in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+
+def _text(value):
+    if value is None:
+        return None
+    value = ' '.join(str(value).split())
+    return value or None
+
+
+def _names(items, *keys):
+    """Plain strings from a list of strings or of dicts keyed by the first present key"""
+    names = []
+    for item in items or []:
+        if isinstance(item, dict):
+            item = next((item[key] for key in keys if item.get(key)), None)
+        item = _text(item)
+        if item:
+            names.append(item)
+    return names
+
+
+def parse_month(value, today=None):
+    """Parse Scrapingdog dates like 'Jan 2012', '2012' or 'Present' into a date, or None"""
+    value = (value or '').strip().lower()
+    if not value:
+        return None
+    if value in ('present', 'current', 'now'):
+        return today or date.today()
+    year = re.search(r'(19|20)\d{2}', value)
+    if not year:
+        return None
+    month = MONTHS.get(value[:3], 1)
+    return date(int(year.group(0)), month, 1)
+
+
+def experience_years(experience, today=None):
+    """Years between the earliest role start and the latest role end"""
+    starts, ends = [], []
+    for role in experience or []:
+        start = parse_month(role.get('starts_at'), today)
+        if start is None:
+            continue
+        starts.append(start)
+        ends.append(parse_month(role.get('ends_at'), today) or today or date.today())
+    if not starts:
+        return None
+    return round(max(0, (max(ends) - min(starts)).days) / 365.25, 1)
+
+
+def enrichment_payload(record):
+    """The Scrapingdog profile dict of a result record; Scrapingdog wraps it in a one-element list"""
+    info = record.get('linkedin_scraping_dog_info')
+    if isinstance(info, list):
+        info = info[0] if info else None
+    return info if isinstance(info, dict) else None
+
+
+def flatten_record(record, today=None):
+    """Flatten a scraped record and its nested enrichment payload into PROFILE_SCHEMA columns"""
+    info = enrichment_payload(record) or {}
+    experience = [role for role in info.get('experience') or [] if isinstance(role, dict)]
+    # Scrapingdog lists the newest role first; prefer one still marked as ongoing
+    current = next((role for role in experience if (role.get('ends_at') or '').strip().lower() == 'present'),
+                   experience[0] if experience else {})
+    location = _text(info.get('location'))
+    education = []
+    for school in info.get('education') or []:
+        if isinstance(school, dict):
+            degree = ' '.join(filter(None, [_text(school.get('college_degree')),
+                                            _text(school.get('college_degree_field'))]))
+            entry = ', '.join(filter(None, [degree, _text(school.get('college_name'))]))
+            if entry:
+                education.append(entry)
+    return {
+        'name': _text(record.get('name')),
+        'profile_url': record.get('profile_url'),
+        'public_identifier': _text(info.get('public_identifier')),
+        'full_name': _text(info.get('fullName')),
+        'headline': _text(info.get('headline')),
+        'location': location,
+        'country': location.split(',')[-1].strip() if location else None,
+        'about': _text(info.get('about')),
+        'current_title': _text(current.get('position')),
+        'current_company': _text(current.get('company_name')),
+        'experience_count': len(experience),
+        'experience_years': experience_years(experience, today),
+        'titles': _names([role.get('position') for role in experience]),
+        'companies': _names([role.get('company_name') for role in experience]),
+        'skills': _names(info.get('skills'), 'name', 'skill'),
+        'education': education,
+        'enriched': bool(info),
+        'score': record.get('score'),
+    }
+
+
+def arrow_schema():
+    """PROFILE_SCHEMA as a pyarrow schema"""
+    import pyarrow as pa
+
+    types = {
+        'string': pa.string(),
+        'int': pa.int32(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'list': pa.list_(pa.string()),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in PROFILE_SCHEMA])
@@ -0,0 +1,108 @@
+import hashlib
+import re
+from urllib.parse import urljoin
+
+# Search result profile links; used both to extract profiles and to detect when results are ready
+PROFILE_LINK_XPATH = "//span[@dir='ltr']/parent::a"
+
+LINKEDIN_URL = "https://www.linkedin.com/"
+
+LAST_PAGE_INDICATORS = [
+    "end of results",
+    "no more results",
+    "last page",
+    "final page"
+]
+
+
+def current_page_number(url):
+    """Page number from a search URL's page parameter, or None on the first (unnumbered) page"""
+    match = re.search(r'page=(\d+)', url or '')
+    return int(match.group(1)) if match else None
+
+
+def result_fingerprint(profiles):
+    """Compact fingerprint of a page's ordered result set, used to detect page changes"""
+    urls = '\n'.join((profile.get('profile_url') or '').split('?')[0] for profile in profiles)
+    return hashlib.sha1(urls.encode()).hexdigest()
+
+
+def _clean_text(text):
+    return ' '.join((text or '').split())
+
+
+def _visible_text(node):
+    """Text content of node without script, style and code text, closer to the browser's innerText"""
+    return ''.join(node.xpath(".//text()[not(ancestor::script or ancestor::style or ancestor::code)]"))
+
+
+def _profile_name(link):
+    """Visible name of a result link, skipping LinkedIn's visually hidden "View X's profile" text"""
+    for xpath in (
+        ".//span[contains(@class, 'entity-result__title-text')]/a/span",
+        "./span[@dir='ltr']/span[@aria-hidden='true']",
+        "./span[@dir='ltr']",
+    ):
+        nodes = link.xpath(xpath)
+        if nodes:
+            return _clean_text(nodes[0].text_content())
+    return _clean_text(link.text_content())
+
+
+def parse_profiles(tree, base_url=LINKEDIN_URL):
+    """Extract [{name, profile_url}] records from a parsed search results page"""
+    records = []
+    for link in tree.xpath(PROFILE_LINK_XPATH):
+        href = link.get('href')
+        if not href:
+            continue
+        records.append({'name': _profile_name(link), 'profile_url': urljoin(base_url, href)})
+    return records
+
+
+def parse_pagination(tree, url=None):
+    """Pagination state of a parsed search results page, mirroring the live last-page checks"""
+    next_disabled = False
+    for button in tree.xpath("//button[contains(@class, 'next') or contains(@aria-label, 'Next')]"):
+        if button.get('disabled') is not None or 'disabled' in (button.get('class') or ''):
+            next_disabled = True
+            break
+
+    body = tree.xpath('//body')
+    text = _clean_text(_visible_text(body[0] if body else tree)).lower()
+    end_of_results = any(indicator in text for indicator in LAST_PAGE_INDICATORS)
+
+    return {
+        'current_page': current_page_number(url),
+        'next_disabled': next_disabled,
+        'end_of_results': end_of_results,
+        'result_count': len(tree.xpath("//li[contains(@class, 'search-result')]")),
+    }
+
+
+def parse_search_page(page_source, url=None):
+    """Parse raw search page HTML into profile records and pagination state without a browser"""
+    from lxml import html as lxml_html
+
+    tree = lxml_html.fromstring(page_source)
+    profiles = parse_profiles(tree, url or LINKEDIN_URL)
+    return {
+        'url': url,
+        'profiles': profiles,
+        'pagination': parse_pagination(tree, url),
+        'fingerprint': result_fingerprint(profiles),
+    }
+
+
+def is_last_page(pagination):
+    """Whether a pagination state says there are no more results"""
+    if pagination['next_disabled'] or pagination['end_of_results']:
+        return True
+    # If less than typical full page (usually 10 or 25), might be last page
+    return 0 < pagination['result_count'] < 5
+
+
+def parse_saved_page(path, url=None):
+    """Re-run extraction on a page saved to disk, e.g. from page_archive_dir"""
+    with open(path, encoding='utf-8') as f:
+        return parse_search_page(f.read(), url)
@@ -0,0 +1,124 @@
+import heapq
+import itertools
+import re
+import zlib
+
+# Relative weight of each feature in the final score
+DEFAULT_WEIGHTS = {
+    'skills': 0.45,
+    'title': 0.30,
+    'experience': 0.15,
+    'location': 0.10,
+}
+
+# Width of the hashed character-trigram vectors used for title similarity
+TRIGRAM_DIM = 512
+
+
+def _tokens(text):
+    return re.findall(r'[a-z0-9+#.]+', (text or '').lower())
+
+
+def trigram_matrix(texts, dim=TRIGRAM_DIM):
+    """L2-normalised hashed character-trigram counts, one row per text"""
+    import numpy as np
+
+    rows, cols = [], []
+    for i, text in enumerate(texts):
+        padded = f"  {' '.join(_tokens(text))} "
+        for j in range(len(padded) - 2):
+            rows.append(i)
+            cols.append(zlib.crc32(padded[j:j + 3].encode()) % dim)
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9)
+
+
+class CandidateRanker:
+    """Scores flattened profiles against a role, skills and locations with vectorised NumPy features"""
+
+    def __init__(self, role, skills=(), locations=(), experience_years=10.0, weights=None, top_k=0):
+        self.role = role
+        self.skills = [skill.lower() for skill in skills]
+        self.locations = [location.lower() for location in locations]
+        self.experience_years = experience_years
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        if not self.skills:
+            self.weights['skills'] = 0.0
+        if not self.locations:
+            self.weights['location'] = 0.0
+        self.top_k = top_k
+        self._top = []
+        self._counter = itertools.count()
+        self._role_vector = trigram_matrix([role or ''])[0]
+
+    def features(self, rows):
+        """(n, 4) matrix of skill overlap, title similarity, experience and location features in [0, 1]"""
+        import numpy as np
+
+        n = len(rows)
+        skill_hits = np.zeros((n, max(1, len(self.skills))), dtype=np.float32)
+        for i, row in enumerate(rows):
+            if not self.skills:
+                break
+            # Listed skills count fully, skills only mentioned in the headline count half
+            listed = {skill.lower() for skill in row.get('skills') or []}
+            headline = (row.get('headline') or '').lower()
+            skill_hits[i] = [1.0 if skill in listed else 0.5 if skill in headline else 0.0 for skill in self.skills]
+
+        # Titles repeat heavily across candidates, so vectorise each distinct title once
+        title_index = {}
+        title_ids = np.array([title_index.setdefault(row.get('current_title') or row.get('headline') or '',
+                                                     len(title_index)) for row in rows], dtype=np.intp)
+        title_similarity = (trigram_matrix(list(title_index)) @ self._role_vector)[title_ids]
+        years = np.array([row.get('experience_years') or 0.0 for row in rows], dtype=np.float32)
+        locations = [(row.get('location') or '').lower() for row in rows]
+        location_hits = np.array([any(loc in location for loc in self.locations) for location in locations],
+                                 dtype=np.float32)
+
+        return np.column_stack([
+            skill_hits.mean(axis=1),
+            title_similarity,
+            np.clip(years / self.experience_years, 0.0, 1.0),
+            location_hits,
+        ])
+
+    def score(self, rows):
+        """Scores in [0, 1] for a batch of flattened profiles; unenriched profiles score 0"""
+        import numpy as np
+
+        if not rows:
+            return np.zeros(0, dtype=np.float32)
+        weights = np.array([self.weights['skills'], self.weights['title'], self.weights['experience'],
+                            self.weights['location']], dtype=np.float32)
+        total = weights.sum()
+        scores = self.features(rows) @ (weights / total if total else weights)
+        scores *= np.array([bool(row.get('enriched')) for row in rows], dtype=np.float32)
+        if self.top_k:
+            self._keep_top(rows, scores)
+        return scores
+
+    def _keep_top(self, rows, scores):
+        """Fold a scored batch into the running top-K"""
+        for i in top_k_indices(scores, self.top_k):
+            entry = (float(scores[i]), next(self._counter), dict(rows[i], score=float(scores[i])))
+            if len(self._top) < self.top_k:
+                heapq.heappush(self._top, entry)
+            elif entry[0] > self._top[0][0]:
+                heapq.heapreplace(self._top, entry)
+
+    def top(self):
+        """Best profiles seen so far, highest score first"""
+        return [row for _, _, row in sorted(self._top, key=lambda entry: (-entry[0], entry[1]))]
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first, without sorting the whole array"""
+    import numpy as np
+
+    if k <= 0 or len(scores) == 0:
+        return np.zeros(0, dtype=np.intp)
+    k = min(k, len(scores))
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
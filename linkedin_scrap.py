@@ -2,41 +2,1101 @@ import logging
 import time
 import random
 import os
-import pandas as pd
-import requests
-from pymongo import MongoClient
-from selenium import webdriver
-from selenium.webdriver import ActionChains
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import os
-from dotenv import load_dotenv, find_dotenv
-import os
-from openai import OpenAI
+import threading
+import sqlite3
+import json
+import re
+import hashlib
+import functools
+import importlib
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field, fields, MISSING as dataclass_missing
+from typing import List, Optional
+# selenium.common only holds exception classes; importing it does not pull in the webdriver package
+from selenium.common.exceptions import TimeoutException
+from linkedin_extract import (PROFILE_LINK_XPATH, LAST_PAGE_INDICATORS, parse_search_page, is_last_page,
+                              current_page_number, result_fingerprint)
+from linkedin_export import PROFILE_COLUMNS, flatten_record, arrow_schema
+from linkedin_rank import CandidateRanker
+
+logger = logging.getLogger(__name__)
+
+
+class _LazyImport:
+    """Stand-in for a module or attribute that is only imported on first use, keeping module import cheap"""
+
+    def __init__(self, module, attribute=None):
+        self._module = module
+        self._attribute = attribute
+
+    def _resolve(self):
+        target = importlib.import_module(self._module)
+        return getattr(target, self._attribute) if self._attribute else target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+
+# Selenium's webdriver package imports every browser binding, so defer it until a driver is needed
+webdriver = _LazyImport('selenium.webdriver')
+Options = _LazyImport('selenium.webdriver.chrome.options', 'Options')
+By = _LazyImport('selenium.webdriver.common.by', 'By')
+Keys = _LazyImport('selenium.webdriver.common.keys', 'Keys')
+WebDriverWait = _LazyImport('selenium.webdriver.support.ui', 'WebDriverWait')
+EC = _LazyImport('selenium.webdriver.support.expected_conditions')
+
+
+SCRAPING_DOG_URL = "https://api.scrapingdog.com/linkedin"
+
+
+def _env_bool(value):
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _env_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+@dataclass
+class ScraperConfig:
+    """Scraper settings, read once from the environment and .env file"""
+
+    # Credentials and search
+    username: Optional[str] = field(default=None, metadata={'env': 'USERNAME'})
+    password: Optional[str] = field(default=None, metadata={'env': 'PASSWORD'})
+    role: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    open_api_key: Optional[str] = None
+    scraping_dog_api_key: Optional[str] = None
+    mongodb_uri: Optional[str] = field(default=None, metadata={'env': 'MONGODB_URI'})
+    linkedin_base_url: str = 'https://www.linkedin.com'
+    scraping_dog_url: str = SCRAPING_DOG_URL
+    # Enrichment
+    enrichment_max_in_flight: int = 5
+    # Starting Scrapingdog requests per second; adapts between the min and max unless adaptive is off
+    enrichment_rate_limit: float = 2.0
+    enrichment_rate_min: float = 0.2
+    enrichment_rate_max: float = 20.0
+    enrichment_adaptive_rate: bool = True
+    enrichment_max_retries: int = 4
+    enrichment_cache_path: Optional[str] = None
+    enrichment_cache_ttl_hours: float = 168.0
+    enrichment_cache_max_entries: int = 50000
+    # Persistence and dedup
+    mongo_batch_size: int = 100
+    result_sinks: List[str] = field(default_factory=lambda: ['mongo', 'excel'])
+    # Relevance ranking against role and skills; top-K export is off when ranking_top_k is 0
+    ranking_enabled: bool = True
+    ranking_locations: List[str] = field(default_factory=list)
+    ranking_experience_years: float = 10.0
+    ranking_top_k: int = 0
+    parquet_row_group_size: int = 1000
+    dedup_scope: str = 'global'
+    dedup_seed_from_mongo: bool = True
+    dedup_seed_timeout_ms: int = 5000
+    dedup_index_path: Optional[str] = None
+    query_cache_path: Optional[str] = None
+    query_cache_ttl_days: float = 30.0
+    # Browser
+    chrome_user_data_dir: Optional[str] = None
+    session_cookies_path: Optional[str] = None
+    reuse_session: bool = True
+    lightweight_browser: bool = False
+    lightweight_window_size: str = '1280,900'
+    blocked_resource_types: List[str] = field(default_factory=lambda: ['image', 'media', 'font', 'tracking'])
+    min_page_interval: float = 2.0
+    page_interval_jitter: float = 1.0
+    results_timeout: float = 15.0
+    extraction_mode: str = 'js'
+    page_archive_dir: Optional[str] = None
+    max_pages: int = 5
+    # Incremental mode only enriches results that changed since the last crawl of the same search
+    incremental: bool = False
+    incremental_stop_after: int = 2
+    prefetch_window: int = 0
+    # Batch runs and observability
+    batch_workers: int = 0
+    roles_path: Optional[str] = None
+    metrics_path: Optional[str] = None
+    metrics_jsonl_path: Optional[str] = None
+    log_level: str = 'INFO'
+
+    @classmethod
+    def from_env(cls):
+        """Build the config from environment variables, converting each to its field's type"""
+        values = {}
+        for config_field in fields(cls):
+            raw = os.getenv(config_field.metadata.get('env', config_field.name))
+            if raw is None:
+                continue
+            if config_field.default_factory is not dataclass_missing:
+                values[config_field.name] = _env_list(raw)
+            elif isinstance(config_field.default, bool):
+                values[config_field.name] = _env_bool(raw)
+            elif isinstance(config_field.default, (int, float)):
+                values[config_field.name] = type(config_field.default)(raw)
+            else:
+                values[config_field.name] = raw
+        return cls(**values)
+
+
+@functools.lru_cache(maxsize=None)
+def get_config():
+    """Load the .env file once and return the shared scraper config"""
+    from dotenv import load_dotenv, find_dotenv
+    load_dotenv(dotenv_path=".env", override=True)
+    logger.info(f"Using .env file at: {find_dotenv()}")
+    return ScraperConfig.from_env()
+
+
+class Metrics:
+    """Per-stage timing spans, counters and gauges, exportable as a Prometheus text file or JSON lines"""
+
+    def __init__(self, samples=1000):
+        self._lock = threading.Lock()
+        self.stage_count = defaultdict(int)
+        self.stage_seconds = defaultdict(float)
+        # Recent durations per stage for p50/p95 in the JSON export
+        self.stage_samples = defaultdict(lambda: deque(maxlen=samples))
+        self.counters = defaultdict(float)
+        self.gauges = {}
+
+    @contextmanager
+    def span(self, stage):
+        """Time a block of work under the given stage name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stage_count[stage] += 1
+                self.stage_seconds[stage] += elapsed
+                self.stage_samples[stage].append(elapsed)
+
+    def timed(self, stage):
+        """Decorator form of span"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    @staticmethod
+    def _percentile(values, q):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))] if values else None
+
+    def snapshot(self):
+        """Current metrics as a plain dict"""
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'stages': {
+                    stage: {
+                        'count': self.stage_count[stage],
+                        'total_seconds': round(self.stage_seconds[stage], 4),
+                        'p50_seconds': self._percentile(self.stage_samples[stage], 50),
+                        'p95_seconds': self._percentile(self.stage_samples[stage], 95),
+                    }
+                    for stage in self.stage_count
+                },
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+            }
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                "# HELP linkedin_scraper_stage_seconds Wall-clock time spent per scraper stage",
+                "# TYPE linkedin_scraper_stage_seconds summary",
+            ]
+            for stage in sorted(self.stage_count):
+                lines.append(f'linkedin_scraper_stage_seconds_count{{stage="{stage}"}} {self.stage_count[stage]}')
+                lines.append(f'linkedin_scraper_stage_seconds_sum{{stage="{stage}"}} {self.stage_seconds[stage]:.6f}')
+            for name in sorted(self.counters):
+                lines.append(f"# TYPE linkedin_scraper_{name}_total counter")
+                lines.append(f"linkedin_scraper_{name}_total {self.counters[name]:g}")
+            for name in sorted(self.gauges):
+                lines.append(f"# TYPE linkedin_scraper_{name} gauge")
+                lines.append(f"linkedin_scraper_{name} {self.gauges[name]:g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, prometheus_path=None, jsonl_path=None):
+        """Write a Prometheus textfile (replaced atomically) and/or append a JSON snapshot line"""
+        if prometheus_path:
+            tmp_path = prometheus_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, prometheus_path)
+        if jsonl_path:
+            with open(jsonl_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.snapshot()) + "\n")
+
+
+# Shared by every scraper and worker in the process
+metrics = Metrics()
+
+# Bump PROMPT_VERSION whenever the query generation prompt changes so cached queries are regenerated
+SEARCH_QUERY_MODEL = "gpt-4"
+PROMPT_VERSION = 1
+
+
+# Collects every result link, its display name and the pagination widget state in one round-trip
+# instead of several per profile plus full page_source transfers for pagination
+EXTRACT_PAGE_STATE_JS = """
+const snapshot = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const records = [];
+for (let i = 0; i < snapshot.snapshotLength; i++) {
+    const link = snapshot.snapshotItem(i);
+    const href = link.href || link.getAttribute('href');
+    if (!href) continue;
+    // Same selectors, in the same order, as linkedin_extract._profile_name
+    const title = link.querySelector("span[class*='entity-result__title-text'] > a > span")
+        || link.querySelector(":scope > span[dir='ltr'] > span[aria-hidden='true']")
+        || link.querySelector(":scope > span[dir='ltr']");
+    records.push({name: ((title || link).textContent || '').split(/\s+/).filter(Boolean).join(' '), profile_url: href});
+}
+let nextDisabled = false;
+for (const button of document.querySelectorAll("button[class*='next'], button[aria-label*='Next']")) {
+    if (button.disabled || String(button.className).includes('disabled')) {
+        nextDisabled = true;
+        break;
+    }
+}
+const text = (document.body ? document.body.innerText : '').toLowerCase();
+return JSON.stringify({
+    profiles: records,
+    pagination: {
+        next_disabled: nextDisabled,
+        end_of_results: arguments[1].some(indicator => text.includes(indicator)),
+        result_count: document.querySelectorAll("li[class*='search-result']").length
+    }
+});
+"""
+
+
+# URL patterns blocked per resource type in lightweight browser mode
+BLOCKED_RESOURCE_PATTERNS = {
+    'image': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*media.licdn.com/dms/image*"],
+    'media': ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*dms.licdn.com/playlist*"],
+    'font': ["*.woff", "*.woff2", "*.ttf", "*.otf"],
+    # Off by default: clickability checks in search_role rely on layout
+    'stylesheet': ["*.css"],
+    'tracking': ["*px.ads.linkedin.com*", "*snap.licdn.com*", "*doubleclick.net*", "*google-analytics.com*",
+                 "*googletagmanager.com*"],
+}
+
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv('open_api_key'))
-# Load the .env file
-# load_dotenv()
-load_dotenv(dotenv_path=".env", override=True)
+class results_settled:
+    """WebDriverWait condition: result links are present and their count has not changed for `quiet` seconds"""
 
-print(f"Using .env file at: {find_dotenv()}")
+    def __init__(self, xpath=PROFILE_LINK_XPATH, quiet=0.5):
+        self.xpath = xpath
+        self.quiet = quiet
+        self.count = None
+        self.since = None
 
-# Fetch credentials
-username = os.getenv('USERNAME')
-# password = os.getenv('PASSWORD')
+    def __call__(self, driver):
+        count = len(driver.find_elements(By.XPATH, self.xpath))
+        now = time.monotonic()
+        if count != self.count:
+            self.count = count
+            self.since = now
+            return False
+        return count > 0 and now - self.since >= self.quiet
+
+
+class AdaptiveRateLimiter:
+    """AIMD request rate for one host: grows while calls succeed, halves on 429/5xx and honours Retry-After"""
+
+    def __init__(self, name, rate=2.0, min_rate=0.2, max_rate=20.0, increase=0.5, decrease=0.5,
+                 latency_target=5.0, cooldown=1.0):
+        """rate is the starting requests per second; min_rate == max_rate gives a fixed rate"""
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+        self._last_decrease = 0.0
+        self._set_gauge()
+
+    def _set_gauge(self):
+        metrics.set_gauge(f"{self.name}_rate_per_second", round(self.rate, 3))
+
+    def acquire(self):
+        """Block until the next request slot is free"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_success(self, latency):
+        """Additive increase of about `increase` requests per second per second of healthy traffic"""
+        if latency > self.latency_target:
+            # Slow answers mean the provider is near its limit, so hold the rate
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            self._set_gauge()
+
+    def on_throttle(self, delay=0.0):
+        """Multiplicative decrease, at most once per cooldown, pausing every caller for delay seconds"""
+        with self._lock:
+            now = time.monotonic()
+            self._next_slot = max(self._next_slot, now + delay)
+            if now - self._last_decrease < self.cooldown:
+                # A burst of in-flight requests hitting the same throttle counts once
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._set_gauge()
+        metrics.incr(f"{self.name}_throttled")
+        logger.info(f"{self.name} throttled, rate lowered to {self.rate:.2f}/s")
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(name, **kwargs):
+    """Process-wide rate limiter for name, so every worker and scraper shares one budget"""
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = AdaptiveRateLimiter(name, **kwargs)
+        return _rate_limiters[name]
+
+
+class EnrichmentError(Exception):
+    """Raised when a Scrapingdog profile lookup fails after all retries"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ScrapingDogClient:
+    """Keep-alive HTTP client for the Scrapingdog LinkedIn API with retries, backoff and Retry-After support"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, api_key, url=SCRAPING_DOG_URL, timeout=(5, 30), max_retries=4,
+                 backoff_base=1.0, backoff_max=30.0, pool_size=10, rate_limiter=None):
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """One pooled session, created on first use, so every lookup reuses an open TLS connection"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def _retry_delay(self, attempt, response=None):
+        """Seconds to wait before the next attempt, preferring the server's Retry-After (capped at backoff_max)"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                from email.utils import parsedate_to_datetime
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                    return min(self.backoff_max, max(0.0, delay))
+                except (TypeError, ValueError):
+                    pass
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get_profile(self, profile_id):
+        """Return the Scrapingdog profile JSON for profile_id or raise EnrichmentError"""
+        import requests
+        params = {
+            "api_key": self.api_key,
+            "type": "profile",
+            "linkId": profile_id,
+            "private": "false"
+        }
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            start = time.monotonic()
+            try:
+                response = self.session.get(self.url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    # requests puts the full URL, api_key included, in its messages, so only the type is kept
+                    raise EnrichmentError(f"Request for {profile_id} failed: {type(e).__name__}") from None
+                self._backoff(self._retry_delay(attempt))
+                continue
+
+            if response.status_code in self.RETRY_STATUSES:
+                if attempt == self.max_retries:
+                    raise EnrichmentError(
+                        f"Request for {profile_id} failed with status code: {response.status_code}",
+                        response.status_code,
+                    )
+                self._backoff(self._retry_delay(attempt, response))
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_success(time.monotonic() - start)
+            if response.status_code == 200:
+                return response.json()
+            raise EnrichmentError(
+                f"Request for {profile_id} failed with status code: {response.status_code}",
+                response.status_code,
+            )
+
+    def _backoff(self, delay):
+        """Wait before a retry; with a shared rate limiter the pause and rate cut apply to every caller"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_throttle(delay)
+        else:
+            time.sleep(delay)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+class EnrichmentCache:
+    """Persistent SQLite cache of Scrapingdog profiles keyed by profile ID, with TTL and LRU eviction"""
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=50000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS enrichment ("
+            "profile_id TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS enrichment_accessed_at ON enrichment (accessed_at)")
+        # Drop anything that expired since the last run
+        self._conn.execute("DELETE FROM enrichment WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_key(profile):
+        """Reduce a profile URL or ID to the bare lowercase LinkedIn profile ID"""
+        profile = profile.split('?')[0].rstrip('/')
+        if '/in/' in profile:
+            profile = profile.split('/in/')[1]
+        return profile.split('/')[-1].lower()
+
+    @classmethod
+    def from_config(cls, config, output_dir):
+        """Build the cache from the enrichment_cache_* settings"""
+        return cls(
+            config.enrichment_cache_path or os.path.join(output_dir, 'enrichment_cache.sqlite'),
+            ttl_seconds=config.enrichment_cache_ttl_hours * 3600,
+            max_entries=config.enrichment_cache_max_entries,
+        )
+
+    def get(self, profile):
+        """Return the cached profile data, or None on a miss or expired entry"""
+        key = self.normalize_key(profile)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM enrichment WHERE profile_id = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM enrichment WHERE profile_id = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE enrichment SET accessed_at = ? WHERE profile_id = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, profile, data):
+        """Store profile data and evict the least recently used entries beyond max_entries.
+
+        Scrapingdog answers with a one-element JSON list, so any JSON value is stored; only None is skipped.
+        """
+        if data is None:
+            return
+        key = self.normalize_key(profile)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enrichment (profile_id, payload, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(data), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM enrichment WHERE profile_id IN ("
+                "SELECT profile_id FROM enrichment ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self):
+        """Hit/miss counters and current size of the cache"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM enrichment").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EnrichmentPool:
+    """Bounded background pool for Scrapingdog enrichment calls; request pacing is left to the client's rate limiter"""
+
+    def __init__(self, fetch, max_in_flight=5, cache=None):
+        """fetch is called with a profile ID"""
+        self.fetch = fetch
+        self.cache = cache
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="enrichment")
+
+    def _run(self, profile_id):
+        with metrics.span('enrichment'):
+            data = self.fetch(profile_id)
+        # Failed lookups return None, which the cache does not keep
+        if self.cache is not None:
+            self.cache.put(profile_id, data)
+        return data
+
+    def submit(self, profile_id, refresh=False):
+        """Queue a profile for enrichment and return a Future with its result; refresh bypasses the cache"""
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(profile_id)
+            if cached is not None:
+                # Cache hits skip both the queue and the rate limit
+                future = Future()
+                future.set_result(cached)
+                return future
+        return self.executor.submit(self._run, profile_id)
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+class MongoWriter:
+    """Long-lived MongoDB writer that upserts applicants in bounded batches keyed on profile URL"""
+
+    def __init__(self, uri, db_name="flexon", collection_name="jobApplicants", batch_size=100):
+        self.uri = uri
+        self.db_name = db_name
+        self.collection_name = collection_name
+        self.batch_size = batch_size
+        self.client = None
+        self._collection = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+
+    @property
+    def collection(self):
+        """The applicants collection; the client and unique index are created on first use"""
+        if self._collection is None:
+            with self._connect_lock:
+                if self._collection is None:
+                    from pymongo import MongoClient
+                    from pymongo.errors import PyMongoError
+                    self.client = MongoClient(self.uri)
+                    collection = self.client[self.db_name][self.collection_name]
+                    try:
+                        # Unique key makes re-runs upsert instead of duplicating applicants
+                        collection.create_index("profile_url", unique=True)
+                    except PyMongoError as e:
+                        logger.warning(f"Could not create profile_url index: {e}")
+                    self._collection = collection
+        return self._collection
+
+    @classmethod
+    def from_config(cls, config):
+        """Build the writer from the MongoDB settings"""
+        return cls(config.mongodb_uri, batch_size=config.mongo_batch_size)
+
+    def stored_profile_urls(self, timeout_ms=5000):
+        """Yield the URLs of enriched applicants through a short-lived client that gives up quickly when Mongo is down"""
+        from pymongo import MongoClient
+        client = MongoClient(self.uri, serverSelectionTimeoutMS=timeout_ms)
+        try:
+            collection = client[self.db_name][self.collection_name]
+            # Stream the URLs rather than distinct() so large histories stay under the 16MB reply limit
+            # Older runs stored error strings in this field, so only a real payload counts as enriched
+            enriched = {'linkedin_scraping_dog_info': {'$type': ['array', 'object']}}
+            for doc in collection.find(enriched, {'profile_url': 1, '_id': 0}):
+                if doc.get('profile_url'):
+                    yield doc['profile_url']
+        finally:
+            client.close()
+
+    def write(self, records):
+        """Queue records and upsert every full batch, returning the profile URLs that failed to upsert"""
+        failed = []
+        with self._lock:
+            self._pending.extend(records)
+            while len(self._pending) >= self.batch_size:
+                batch = self._pending[:self.batch_size]
+                self._pending = self._pending[self.batch_size:]
+                failed.extend(self._bulk_upsert(batch) or [])
+        return failed
+
+    def upsert(self, records):
+        """Upsert exactly these records now, returning only their profile URLs that failed to upsert"""
+        failed = []
+        # Bypasses the shared queue, so concurrent workers never flush (or get blamed for) each other's records
+        with self._lock:
+            for start in range(0, len(records), self.batch_size):
+                failed.extend(self._bulk_upsert(records[start:start + self.batch_size]) or [])
+        return failed
+
+    def flush(self):
+        """Upsert whatever is still queued, returning the profile URLs that failed to upsert"""
+        with self._lock:
+            if not self._pending:
+                return []
+            batch, self._pending = self._pending, []
+            return self._bulk_upsert(batch) or []
+
+    def _bulk_upsert(self, batch):
+        from pymongo import UpdateOne
+        from pymongo.errors import BulkWriteError, PyMongoError
+
+        operations = [
+            UpdateOne(
+                {'profile_url': record['profile_url']},
+                {'$set': {k: v for k, v in record.items() if k != '_id'}},
+                upsert=True,
+            )
+            for record in batch
+        ]
+        try:
+            result = self.collection.bulk_write(operations, ordered=False)
+            logger.info(f"MongoDB upsert: {result.upserted_count} inserted, {result.modified_count} updated, "
+                        f"{result.matched_count - result.modified_count} unchanged.")
+            return []
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            logger.warning(f"MongoDB bulk upsert partially failed: {len(errors)} errors")
+            return [batch[error['index']]['profile_url'] for error in errors]
+        except PyMongoError as e:
+            logger.warning(f"MongoDB bulk upsert failed: {e}")
+            return [record['profile_url'] for record in batch]
+
+    def close(self):
+        self.flush()
+        if self.client is not None:
+            self.client.close()
+
+
+class ProfileIndex:
+    """Dedup index of profile IDs: an in-memory set for this run backed by a local file and MongoDB"""
+
+    def __init__(self, path=None, profile_urls=None):
+        """profile_urls optionally seeds the index, e.g. with MongoWriter.stored_profile_urls()"""
+        self._seen = set()
+        # Profiles claimed by this process, so refreshed profiles are still only enriched once per run
+        self._claimed = set()
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self._file = None
+        if path:
+            if os.path.exists(path):
+                # Older index files hold full URLs, newer ones bare IDs; both normalize to the ID
+                with open(path, encoding='utf-8') as f:
+                    self._seen.update(self._key(line.strip()) for line in f if line.strip())
+            self._file = open(path, 'a', encoding='utf-8')
+        if profile_urls is not None:
+            try:
+                for profile_url in profile_urls:
+                    self._seen.add(self._key(profile_url))
+            except Exception as e:
+                logger.warning(f"Could not load stored profiles from MongoDB: {e}")
+        logger.info(f"Dedup index loaded with {len(self._seen)} known profiles")
+
+    @staticmethod
+    def _key(profile_url):
+        # /in/abc, /in/ABC/ and /in/abc?trk=... are the same person
+        return EnrichmentCache.normalize_key(profile_url)
+
+    def claim(self, profile_url, refresh=False):
+        """Mark a profile as seen, returning False if it was already seen in this or (unless refresh) an earlier run"""
+        profile_url = self._key(profile_url)
+        with self._lock:
+            if profile_url in self._claimed or (not refresh and profile_url in self._seen):
+                self.skipped += 1
+                return False
+            self._seen.add(profile_url)
+            self._claimed.add(profile_url)
+            return True
+
+    def mark_persisted(self, profile_urls):
+        """Record persisted profiles in the local file so later runs skip them"""
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.writelines(f"{self._key(url)}\n" for url in profile_urls)
+            self._file.flush()
+
+    def __contains__(self, profile_url):
+        return self._key(profile_url) in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+    @classmethod
+    def from_config(cls, config, output_dir, mongo_writer=None):
+        """Build the index from dedup_index_path and dedup_seed_from_mongo; dedup_scope=run keeps it in memory only"""
+        if config.dedup_scope.lower() == 'run':
+            return cls()
+        # Seeding only makes sense when results actually go to Mongo
+        seed = (config.dedup_seed_from_mongo and mongo_writer is not None and mongo_writer.uri
+                and 'mongo' in [sink.lower() for sink in config.result_sinks])
+        return cls(
+            config.dedup_index_path or os.path.join(output_dir, 'seen_profiles.txt'),
+            profile_urls=mongo_writer.stored_profile_urls(config.dedup_seed_timeout_ms) if seed else None,
+        )
+
+
+class QueryCache:
+    """JSON file cache of generated LinkedIn boolean search queries with expiry"""
+
+    def __init__(self, path, ttl_seconds=30 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable query cache {path}: {e}")
+
+    @staticmethod
+    def key(role, skills, model, prompt_version):
+        raw = json.dumps([role.strip().lower(), sorted(s.lower() for s in skills), model, prompt_version])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key):
+        """Return the cached query, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry['created_at'] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry['query']
+
+    def put(self, key, query):
+        with self._lock:
+            self._entries[key] = {'query': query, 'created_at': time.time()}
+            if self.path:
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_path, self.path)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    @classmethod
+    def from_config(cls, config, output_dir):
+        """Build the cache from query_cache_path and query_cache_ttl_days"""
+        return cls(
+            config.query_cache_path or os.path.join(output_dir, 'query_cache.json'),
+            ttl_seconds=config.query_cache_ttl_days * 24 * 3600,
+        )
+
+
+@dataclass(slots=True)
+class ProfileRecord:
+    """Compact scraped profile; records live only until their page is flushed to the sinks"""
+
+    profile_id: str
+    name: str
+    profile_url: str
+    role: Optional[str] = None
+    page: Optional[int] = None
+    # pending until enrichment resolves, then enriched or failed
+    status: str = 'pending'
+    found_at: float = field(default_factory=time.time)
+    enriched_at: Optional[float] = None
+    # Raw Scrapingdog response (a JSON list), None until enriched
+    payload: Optional[list] = None
+    # Relevance to the searched role, set when the page is flushed
+    score: Optional[float] = None
+    # Re-enrichment of a profile whose search card changed since the last incremental crawl
+    refresh: bool = False
+    future: Optional[Future] = None
+
+    @property
+    def enriched(self):
+        return self.status == 'enriched'
+
+    def to_document(self):
+        """Full result document written to the sinks"""
+        return {
+            'name': self.name,
+            'profile_url': self.profile_url,
+            'role': self.role,
+            'page': self.page,
+            'status': self.status,
+            'found_at': self.found_at,
+            'enriched_at': self.enriched_at,
+            'score': self.score,
+            'linkedin_scraping_dog_info': self.payload,
+        }
+
+
+class MongoSink:
+    """Result sink that streams records into MongoDB through a MongoWriter"""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, records):
+        """Upsert a page immediately, so it is durable before the page is checkpointed; returns failed URLs"""
+        return self.writer.upsert(records)
+
+    def close(self):
+        self.writer.flush()
+
+
+class JsonlSink:
+    """Result sink that appends one JSON document per line, flattened unless flatten=False"""
+
+    def __init__(self, path, flatten=True):
+        self.path = path
+        self.flatten = flatten
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def write(self, records):
+        for record in records:
+            row = flatten_record(record) if self.flatten else record
+            self.file.write(json.dumps(row, default=str) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ExcelSink:
+    """Result sink that streams flattened rows into an xlsx file using openpyxl's write-only mode"""
+
+    def __init__(self, path, columns=PROFILE_COLUMNS):
+        from openpyxl import Workbook
+        self.path = path
+        self.columns = list(columns)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(self.columns)
+
+    def write(self, records):
+        for record in records:
+            row = flatten_record(record)
+            self.sheet.append(['; '.join(row[column]) if isinstance(row[column], list) else row[column]
+                               for column in self.columns])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class ParquetSink:
+    """Result sink that writes flattened rows to Parquet, one row group per row_group_size records"""
+
+    def __init__(self, path, row_group_size=1000):
+        import pyarrow.parquet as pq
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = arrow_schema()
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        self._rows = []
+
+    def write(self, records):
+        self._rows.extend(flatten_record(record) for record in records)
+        if len(self._rows) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self):
+        import pyarrow as pa
+        if self._rows:
+            self.writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self):
+        self._write_row_group()
+        self.writer.close()
+
+
+class SearchCheckpoint:
+    """JSON checkpoint of a role search so an interrupted run can resume where it stopped"""
+
+    def __init__(self, path):
+        self.path = path
+        self.search_url = None
+        self.last_page = 0
+        self.persisted = set()
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    state = json.load(f)
+                self.search_url = state.get('search_url')
+                self.last_page = state.get('last_page', 0)
+                self.persisted = set(state.get('persisted', []))
+                logger.info(f"Loaded checkpoint: page {self.last_page} done, {len(self.persisted)} profiles persisted")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+
+    def record_page(self, page_num, search_url, profile_urls):
+        """Mark page_num as completed and its profiles as persisted"""
+        self.last_page = page_num
+        self.search_url = search_url
+        self.persisted.update(profile_urls)
+        self.save()
+
+    def resume_url(self):
+        """URL of the page after the last completed one, or None if there is nothing to resume"""
+        if not self.search_url or not self.last_page:
+            return None
+        next_page = self.last_page + 1
+        if re.search(r'page=\d+', self.search_url):
+            return re.sub(r'page=\d+', f'page={next_page}', self.search_url)
+        separator = '&' if '?' in self.search_url else '?'
+        return f"{self.search_url}{separator}page={next_page}"
+
+    def save(self):
+        # Write to a temp file first so a crash never leaves a truncated checkpoint
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'search_url': self.search_url,
+                'last_page': self.last_page,
+                'persisted': sorted(self.persisted),
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint once a search has completed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class SearchSnapshot:
+    """Ordered result IDs and card names per page from the previous crawl of a search, for incremental re-scrapes"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    state = json.load(f)
+                self.pages = {int(page): entries for page, entries in state.get('pages', {}).items()}
+                logger.info(f"Loaded search snapshot with {len(self.pages)} pages")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable search snapshot {path}: {e}")
+        # Every profile seen by the previous crawl, whatever page it was on
+        self.known = {profile_id: name for entries in self.pages.values() for profile_id, name in entries}
 
-print(f"Username: {username}")
+    @staticmethod
+    def _entry(record):
+        return EnrichmentCache.normalize_key(record.get('profile_url') or ''), record.get('name') or ''
+
+    def diff(self, records):
+        """Records that are new since the previous crawl or whose result card changed"""
+        fresh = []
+        for record in records:
+            profile_id, name = self._entry(record)
+            if self.known.get(profile_id) != name:
+                fresh.append(record)
+        return fresh
+
+    def is_changed(self, record):
+        """Whether a profile was in the previous crawl, i.e. a diffed record is changed rather than new"""
+        return self._entry(record)[0] in self.known
+
+    def record_page(self, page_num, records, exclude=(), stale=()):
+        """Replace page_num's entries with this crawl's ordered results, leaving out the excluded profile IDs.
+
+        Stale profile IDs keep the previous crawl's card name, so the next crawl still sees them as changed.
+        """
+        entries = []
+        for profile_id, name in map(self._entry, records):
+            if not profile_id or profile_id in exclude:
+                continue
+            if profile_id in stale and profile_id in self.known:
+                name = self.known[profile_id]
+            entries.append([profile_id, name])
+        self.pages[page_num] = entries
+        self.known.update(entries)
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': time.time(), 'pages': self.pages}, f)
+        os.replace(tmp_path, self.path)
 
 
 class LinkedInScraper:
-    def __init__(self, excel_path=None):
-        """Initialize the LinkedIn scraper with the excel file path"""
+    def __init__(self, excel_path=None, enrichment_cache=None, mongo_writer=None, user_data_dir=None,
+                 profile_index=None, query_cache=None, config=None):
+        """Initialize the LinkedIn scraper with the excel file path and optional shared cache, Mongo writer and dedup index"""
+        self.config = config or get_config()
+        config = self.config
         if excel_path is None:
             # Default path if none provided
             self.excel_path = os.path.join(os.getcwd(), 'linkedin_data.xlsx')
@@ -44,53 +1104,207 @@ class LinkedInScraper:
             # Use provided path
             self.excel_path = excel_path
             
-        self.results = []
-        self.setup_driver()
-        
         # Create output directory if it doesn't exist
         self.output_dir = os.path.join(os.path.dirname(self.excel_path), 'linkedin_results')
         os.makedirs(self.output_dir, exist_ok=True)
-        
+
+        # Buffer of ProfileRecords for the page being persisted; flushed to self.sinks after every page
+        self.results = []
+        self.current_role = None
+        self.current_page = None
+        self.ranker = None
+        # Incremental mode: previous crawl of the search and this page's full, unfiltered results
+        self.snapshot = None
+        self._page_records = None
+        self.total_results = 0
+        self.sinks = []
+        self.checkpoint = None
+        # Overridable so the benchmark can point the scraper at local stand-ins
+        self.linkedin_url = config.linkedin_base_url.rstrip('/')
+        # Authenticated sessions are reused through a Chrome profile directory and/or a cookie jar
+        self.user_data_dir = user_data_dir or config.chrome_user_data_dir
+        self.cookies_path = config.session_cookies_path or os.path.join(self.output_dir, 'linkedin_cookies.json')
+        # Headless, smaller window and blocked heavy resources to cut page load time and memory per driver
+        self.lightweight = config.lightweight_browser
+        # Pacing floor between page loads, kept separate from waiting for the page to be ready
+        self.min_page_interval = config.min_page_interval
+        self.page_interval_jitter = config.page_interval_jitter
+        self.results_timeout = config.results_timeout
+        self._last_navigation = 0.0
+        self._ready_url = None
+        # Optional metrics exports, refreshed after every page
+        self.metrics_path = config.metrics_path
+        self.metrics_jsonl_path = config.metrics_jsonl_path
+        # 'js' extracts each page with one execute_script call, 'html' parses page_source in-process,
+        # 'xpath' uses per-element WebDriver queries
+        self.extraction_mode = config.extraction_mode.lower()
+        # Optional directory where html mode keeps every fetched page for offline reprocessing
+        self.page_archive_dir = config.page_archive_dir
+        # Profiles, pagination and fingerprint of the loaded page, read once and shared by extraction
+        # and pagination checks
+        self._page_state = None
+        self._previous_fingerprint = None
+        # Search queries being generated in the background, keyed by role
+        self._search_queries = {}
+        self._query_executor = None
+        # Upcoming pages loading in background tabs as (page number, url, window handle)
+        self.prefetch_window = config.prefetch_window
+        self._prefetched = deque()
+        self.enrichment_cache = enrichment_cache or EnrichmentCache.from_config(config, self.output_dir)
+        self.enrichment_client = ScrapingDogClient(
+            config.scraping_dog_api_key,
+            url=config.scraping_dog_url,
+            max_retries=config.enrichment_max_retries,
+            pool_size=config.enrichment_max_in_flight,
+            # One adaptive budget per process, shared by every scraper and batch worker; a rate of 0 disables it
+            rate_limiter=shared_rate_limiter(
+                'scrapingdog',
+                rate=config.enrichment_rate_limit,
+                min_rate=min(config.enrichment_rate_min, config.enrichment_rate_limit),
+                max_rate=config.enrichment_rate_max if config.enrichment_adaptive_rate else config.enrichment_rate_limit,
+            ) if config.enrichment_rate_limit > 0 else None,
+        )
+        self.enrichment_pool = EnrichmentPool(
+            self.linkedin_scraping_dog,
+            max_in_flight=config.enrichment_max_in_flight,
+            cache=self.enrichment_cache,
+        )
+        self.owns_mongo_writer = mongo_writer is None
+        self.mongo_writer = mongo_writer or MongoWriter.from_config(config)
+        self.owns_profile_index = profile_index is None
+        self.profile_index = profile_index or ProfileIndex.from_config(config, self.output_dir, self.mongo_writer)
+        self.query_cache = query_cache or QueryCache.from_config(config, self.output_dir)
+        # Chrome and the OpenAI client are only started when first needed, so cache-warm runs skip them
+        self._driver = None
+        self._wait = None
+        self._openai_client = None
+
+    @property
+    def driver(self):
+        """The Chrome WebDriver, started on first use"""
+        if self._driver is None:
+            self.setup_driver()
+        return self._driver
+
+    @property
+    def wait(self):
+        if self._wait is None:
+            self._wait = WebDriverWait(self.driver, 15)
+        return self._wait
+
+    @property
+    def openai_client(self):
+        """OpenAI client, created on the first search query cache miss"""
+        if self._openai_client is None:
+            from openai import OpenAI
+            self._openai_client = OpenAI(api_key=self.config.open_api_key)
+        return self._openai_client
+
     def setup_driver(self):
         """Set up the Chrome WebDriver with appropriate options"""
         chrome_options = Options()
-        # Uncomment the line below if you want to run in headless mode
-        # chrome_options.add_argument("--headless")
+        # Set lightweight_browser=true to run headless with heavy resources blocked
+        if self.lightweight:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument(f"--window-size={self.config.lightweight_window_size}")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--mute-audio")
+            chrome_options.add_argument("--disable-background-networking")
+            chrome_options.add_argument("--disable-component-update")
+            chrome_options.add_argument("--disable-default-apps")
+            chrome_options.add_argument("--disable-sync")
+            chrome_options.add_argument("--renderer-process-limit=2")
+            chrome_options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+        else:
+            chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--disable-extensions")
+        if self.user_data_dir:
+            # A persistent profile keeps the LinkedIn session between runs
+            os.makedirs(self.user_data_dir, exist_ok=True)
+            chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
         
         # Add user agent to appear more like a regular browser
         chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36")
         
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.set_page_load_timeout(30)  # Increase page load timeout
-            self.wait = WebDriverWait(self.driver, 15)  # Increase wait timeout
+            self._driver = webdriver.Chrome(options=chrome_options)
+            self._driver.set_page_load_timeout(30)  # Increase page load timeout
+            self._wait = WebDriverWait(self._driver, 15)  # Increase wait timeout
         except Exception as e:
-            print(f"Error setting up driver: {e}")
-            print("Trying alternative approach...")
+            logger.error(f"Error setting up driver: {e}")
+            logger.warning("Trying alternative approach...")
             try:
                 from webdriver_manager.chrome import ChromeDriverManager
                 from selenium.webdriver.chrome.service import Service
                 service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                self.driver.set_page_load_timeout(30)
-                self.wait = WebDriverWait(self.driver, 15)
+                self._driver = webdriver.Chrome(service=service, options=chrome_options)
+                self._driver.set_page_load_timeout(30)
+                self._wait = WebDriverWait(self._driver, 15)
             except Exception as e2:
-                print(f"Alternative approach also failed: {e2}")
-                print("Please ensure Chrome and ChromeDriver are installed and compatible")
+                logger.warning(f"Alternative approach also failed: {e2}")
+                logger.warning("Please ensure Chrome and ChromeDriver are installed and compatible")
                 exit(1)
+
+        if self.lightweight:
+            self._block_heavy_resources()
+
+    def _block_heavy_resources(self):
+        """Block the resource types listed in blocked_resource_types through CDP request interception"""
+        types = [t.lower() for t in self.config.blocked_resource_types]
+        patterns = [pattern for t in types for pattern in BLOCKED_RESOURCE_PATTERNS.get(t, [])]
+        if not patterns:
+            return
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logger.info(f"Blocking {len(patterns)} resource patterns for: {', '.join(types)}")
+        except Exception as e:
+            logger.warning(f"Could not enable resource blocking: {e}")
         
     
+    @metrics.timed('pacing')
+    def _pace(self):
+        """Sleep only as long as needed to respect the configured request rate"""
+        floor = self.min_page_interval + random.uniform(0, self.page_interval_jitter)
+        remaining = floor - (time.monotonic() - self._last_navigation)
+        if remaining > 0:
+            time.sleep(remaining)
+        self._last_navigation = time.monotonic()
+
+    def _navigate(self, url):
+        """Load url once the pacing floor allows it"""
+        self._pace()
+        self._ready_url = None
+        self._page_state = None
+        # Timed apart from the deliberate pacing sleep, which is reported as its own 'pacing' stage
+        with metrics.span('navigation'):
+            self.driver.get(url)
+
+    @metrics.timed('wait')
+    def _wait_for_results(self, timeout=None):
+        """Return as soon as the search result list is present and stable, or False on timeout"""
+        if self._ready_url is not None and self._ready_url == self.driver.current_url:
+            return True
+        try:
+            WebDriverWait(self.driver, timeout or self.results_timeout, poll_frequency=0.25).until(results_settled())
+            self._ready_url = self.driver.current_url
+            return True
+        except TimeoutException:
+            logger.warning("Timed out waiting for search results to settle")
+            return False
+
+    @metrics.timed('login')
     def login(self, username, password):
         """Login to LinkedIn with the provided credentials"""
         try:
-            self.driver.get("https://www.linkedin.com/login")
-            time.sleep(random.randint(5, 10))  # Random wait to avoid detection
+            self._navigate(f"{self.linkedin_url}/login")
             
             # Enter username
             username_field = self.wait.until(EC.presence_of_element_located((By.ID, "username")))
@@ -110,40 +1324,147 @@ class LinkedInScraper:
             login_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']")))
             login_button.click()
             
-            # Wait for login to complete
-            time.sleep(random.randint(5, 10))  # Random wait to avoid detection
-            
             # Check if login was successful by verifying we're on the home page
             try:
                 self.wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'global-nav__me')]")))
-                print("Login successful")
+                logger.info("Login successful")
                 return True
             except TimeoutException:
-                print("Login failed or authentication challenge detected")
+                logger.warning("Login failed or authentication challenge detected")
                 return False
                 
         except Exception as e:
-            print(f"Error during login: {e}")
+            logger.error(f"Error during login: {e}")
             return False
     
+    def _session_is_valid(self, timeout=5):
+        """Cheaply check whether the browser is already signed in"""
+        try:
+            self._navigate(f"{self.linkedin_url}/feed/")
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'global-nav__me')]"))
+            )
+            return True
+        except Exception:
+            return False
+
+    def _load_cookies(self):
+        """Load the saved cookie jar into the browser, returning False if there is none"""
+        if not os.path.exists(self.cookies_path):
+            return False
+        try:
+            with open(self.cookies_path, encoding='utf-8') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cookie jar {self.cookies_path}: {e}")
+            return False
+        # Cookies can only be set for the domain that is currently loaded
+        self._navigate(f"{self.linkedin_url}/")
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception:
+                continue
+        return True
+
+    def _save_cookies(self):
+        """Export the current session cookies so later runs and workers can skip the login form"""
+        try:
+            # Workers save concurrently, so each writes its own temp file before the atomic replace
+            tmp_path = f"{self.cookies_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            # The jar holds live session tokens, so keep it private to the current user
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.driver.get_cookies(), f)
+            os.replace(tmp_path, self.cookies_path)
+        except Exception as e:
+            logger.warning(f"Could not save session cookies: {e}")
+
+    @metrics.timed('session')
+    def ensure_logged_in(self, username, password):
+        """Reuse a saved authenticated session when it is still valid, otherwise log in with the form"""
+        if self.config.reuse_session:
+            if self.user_data_dir and self._session_is_valid():
+                logger.info("Reusing authenticated Chrome profile")
+                return True
+            if self._load_cookies() and self._session_is_valid():
+                logger.info("Reusing saved LinkedIn session cookies")
+                return True
+            logger.info("No valid saved session, logging in")
+        if not self.login(username, password):
+            return False
+        self._save_cookies()
+        return True
+
+    def _skills(self):
+        """Skills from the comma-separated skills setting"""
+        return self.config.skills
+
+    def build_people_search_query(self, role):
+        """Return the boolean people-search query for role, generating it with the LLM only on a cache miss"""
+        skills = self._skills()
+        key = QueryCache.key(role, skills, SEARCH_QUERY_MODEL, PROMPT_VERSION)
+        query = self.query_cache.get(key)
+        if query is None:
+            titles = self.generate_linkedin_search_string(role).split("OR")
+            query = self.normalize_titles_and_generate_query(titles, skills)
+            self.query_cache.put(key, query)
+            logger.info(f"Generated search string: {query}")
+        else:
+            logger.info(f"Using cached search string: {query}")
+        return query
+
+    def prefetch_search_query(self, role):
+        """Start building the search query for role in the background, e.g. while Chrome starts and logs in"""
+        if not role or role in self._search_queries:
+            return
+        if SearchCheckpoint(self._checkpoint_path(role)).resume_url():
+            # scrape_role will resume from the checkpoint without searching
+            return
+        if self._query_executor is None:
+            self._query_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query")
+        self._search_queries[role] = self._query_executor.submit(self.build_people_search_query, role)
+
+    def _search_query(self, role):
+        """The prefetched search query for role, or a freshly built one if none was prefetched or it failed"""
+        future = self._search_queries.pop(role, None)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as e:
+                logger.warning(f"Background search query generation failed, retrying: {e}")
+        return self.build_people_search_query(role)
+
+    def _people_search_url(self, role):
+        return f"{self.linkedin_url}/search/results/people/?keywords={self._search_query(role)}"
+
+    @metrics.timed('search')
     def search_role(self, role):
         """Search for the given role and apply people filter"""
+        if role in self._search_queries:
+            # The query is already being built, so skip the typeahead and People filter clicks
+            try:
+                search_url = self._people_search_url(role)
+                logger.info(f"Using precomputed people search URL: {search_url}")
+                self._navigate(search_url)
+                if self._wait_for_results():
+                    return True
+                logger.warning("Precomputed search URL showed no results, falling back to the search box")
+            except Exception as e:
+                logger.warning(f"Precomputed search failed, falling back to the search box: {e}")
         try:
             # Navigate to LinkedIn search page directly
-            self.driver.get("https://www.linkedin.com/search/results/all/")
+            self._navigate(f"{self.linkedin_url}/search/results/all/")
             # self.driver.find_element(By.XPATH, "//input[@placeholder='Search']").click()
-            time.sleep(random.randint(5, 10))  # Random wait to avoid detection
             
             # Wait for the search box and click on it
             search_box = self.wait.until(EC.element_to_be_clickable((By.XPATH, "//input[contains(@class, 'search-global-typeahead__input')]")))
             search_box.click()
             search_box.clear()
             search_box.send_keys(role)
+            self._pace()
             search_box.send_keys(Keys.ENTER)
             
-            # Wait longer for search results to load
-            time.sleep(random.randint(5, 10))  # Random wait to avoid detection
-            
             # Try different approaches to find and click the People filter
             try:
                 # First attempt - standard approach
@@ -161,64 +1482,124 @@ class LinkedInScraper:
                         filter_section.find_element(By.XPATH, ".//button[contains(text(), 'People') or contains(@aria-label, 'People')]").click()
                     except:
                         # Fourth attempt - try direct URL with query parameter
-                        role = self.generate_linkedin_search_string(role)
-                        role = role.split("OR")
-                        skills = os.getenv('skills')
-                        normalize_titles_and_generate_query = self.normalize_titles_and_generate_query(role, skills)
-                        print(f"Generated search string: {normalize_titles_and_generate_query}")
-                        search_url = f"https://www.linkedin.com/search/results/people/?keywords={normalize_titles_and_generate_query}"
-                        print(f"Using direct URL: {search_url}")
-                        self.driver.get(search_url)
+                        search_url = self._people_search_url(role)
+                        logger.info(f"Using direct URL: {search_url}")
+                        self._navigate(search_url)
             
-            # Wait longer for the people filter to be applied
-            time.sleep(random.randint(5, 10))  # Random wait to avoid detection
+            # Wait for the people results instead of a fixed delay
+            self._wait_for_results()
             
             # Verify that we're looking at people results
             try:
                 self.wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'search-results__cluster')]")))
-                print("Successfully filtered to people results")
+                logger.info("Successfully filtered to people results")
                 return True
             except:
                 # One more attempt with a direct URL
-                role = self.generate_linkedin_search_string(role)
-                role = role.split("OR")
-                skills = os.getenv('skills')
-                normalize_titles_and_generate_query = self.normalize_titles_and_generate_query(role, skills)
-                print(f"Generated search string: {normalize_titles_and_generate_query}")
-                search_url = f"https://www.linkedin.com/search/results/people/?keywords={normalize_titles_and_generate_query}"
-                print(f"Using direct URL as fallback: {search_url}")
-                self.driver.get(search_url)
-                time.sleep(random.randint(5, 10))  # Random wait to avoid detection
+                search_url = self._people_search_url(role)
+                logger.info(f"Using direct URL as fallback: {search_url}")
+                self._navigate(search_url)
+                self._wait_for_results()
                 return True
             
         except Exception as e:
-            print(f"Error during role search: {e}")
+            logger.error(f"Error during role search: {e}")
             # Try one final approach - direct URL navigation
             try:
-                role = self.generate_linkedin_search_string(role)
-                role = role.split("OR")
-                skills = os.getenv('skills')
-                normalize_titles_and_generate_query = self.normalize_titles_and_generate_query(role, skills)
-                print(f"Generated search string: {normalize_titles_and_generate_query}")
-                search_url = f"https://www.linkedin.com/search/results/people/?keywords={normalize_titles_and_generate_query}"
-                search_url = f"https://www.linkedin.com/search/results/people/?keywords={role}"
-                print(f"Using direct URL after error: {search_url}")
-                self.driver.get(search_url)
-                time.sleep(random.randint(5, 10))  # Random wait to avoid detection
+                search_url = self._people_search_url(role)
+                logger.info(f"Using direct URL after error: {search_url}")
+                self._navigate(search_url)
+                self._wait_for_results()
                 return True
             except:
                 return False
     
+    def _read_page_state_js(self, url):
+        """Profiles and pagination state from a single script call"""
+        state = json.loads(self.driver.execute_script(EXTRACT_PAGE_STATE_JS, PROFILE_LINK_XPATH, LAST_PAGE_INDICATORS))
+        state['url'] = url
+        state['pagination']['current_page'] = current_page_number(url)
+        state['fingerprint'] = result_fingerprint(state['profiles'])
+        return state
+
+    def _read_page_state_html(self, url):
+        """Fetch the page HTML once and parse profiles and pagination state offline"""
+        page_source = self.driver.page_source
+        if self.page_archive_dir:
+            os.makedirs(self.page_archive_dir, exist_ok=True)
+            name = hashlib.sha1(url.encode()).hexdigest()[:16]
+            with open(os.path.join(self.page_archive_dir, f"{name}.html"), 'w', encoding='utf-8') as f:
+                f.write(page_source)
+        return parse_search_page(page_source, url)
+
+    def _current_page_state(self):
+        """State of the loaded page, computed once per page and shared with extraction; None on failure"""
+        url = self.driver.current_url
+        if self._page_state is not None and self._page_state['url'] == url:
+            return self._page_state
+        try:
+            if self.extraction_mode == 'html':
+                self._page_state = self._read_page_state_html(url)
+            else:
+                self._page_state = self._read_page_state_js(url)
+        except Exception as e:
+            logger.warning(f"Could not read page state: {e}")
+            self._page_state = None
+        return self._page_state
+
+    def _build_page_results(self, records):
+        """Turn extracted {name, profile_url} records into page results and queue their enrichment"""
+        if self.snapshot is not None:
+            self._page_records = records
+            records = self.snapshot.diff(records)
+            metrics.incr('profiles_unchanged', len(self._page_records) - len(records))
+        page_results = []
+        for record in records:
+            profile_url = (record.get('profile_url') or '').split('?')[0]  # Remove URL parameters
+            # Profiles whose result card changed since the last crawl are enriched again
+            refresh = self.snapshot is not None and self.snapshot.is_changed(record)
+            if not profile_url or not self._claim_profile(profile_url, refresh):
+                continue
+            profile_id = profile_url.rstrip('/').split('/')[-1]
+            # Use part of URL as fallback name
+            page_results.append(self._new_record(record.get('name') or profile_id, profile_url, profile_id, refresh))
+        return page_results
+
+    def _new_record(self, name, profile_url, profile_id, refresh=False):
+        """A ProfileRecord for the current role and page whose enrichment is queued in the background"""
+        return ProfileRecord(
+            profile_id=profile_id,
+            name=name,
+            profile_url=profile_url,
+            role=self.current_role,
+            page=self.current_page,
+            refresh=refresh,
+            future=self.enrichment_pool.submit(profile_id, refresh),
+        )
+
     def scrape_profiles_on_page(self):
         """Scrape all profile names and URLs on the current page"""
+        # Wait until the result list is present and stable
+        self._wait_for_results()
+        with metrics.span('extraction'):
+            return self._extract_page_results()
+
+    def _extract_page_results(self):
+        """Extract profiles from the loaded page and queue their enrichment"""
         try:
-            # Wait longer for search results to load
-            time.sleep(random.randint(5, 10))  # Random wait to avoid detection
+            if self.extraction_mode in ('js', 'html'):
+                state = self._current_page_state()
+                records = state['profiles'] if state else None
+                if records:
+                    page_results = self._build_page_results(records)
+                    logger.info(f"Scraped {len(page_results)} profiles from current page")
+                    return page_results
+                logger.warning(f"{self.extraction_mode} extraction found no profiles, falling back to XPath extraction")
             
             # Try multiple selector approaches
             profile_containers = []
             selectors_to_try = [
-                "//span[@dir='ltr']/parent::a",
+                PROFILE_LINK_XPATH,
                 # "//li[contains(@class, 'reusable-search__result-container')]",
                 # "//div[contains(@class, 'entity-result')]",
                 # "//div[contains(@class, 'search-results__list')]//li"
@@ -228,8 +1609,7 @@ class LinkedInScraper:
                 try:
                     profile_containers = self.driver.find_elements(By.XPATH, selector)
                     if profile_containers:
-                        print(f"Found {len(profile_containers)} profiles using selector: {selector}")
-                        print(f" Profile containers is {profile_containers}")
+                        logger.info(f"Found {len(profile_containers)} profiles using selector: {selector}")
                         break
                 except:
                     continue
@@ -241,12 +1621,12 @@ class LinkedInScraper:
             page_results = []
             
             if not profile_containers:
-                print("No profile containers found. Trying alternative approach...")
+                logger.warning("No profile containers found. Trying alternative approach...")
                 # Try a more general approach
                 try:
                     # Look for any links that have LinkedIn profile patterns
                     profile_links = self.driver.find_elements(By.XPATH, "//span[@dir='ltr']/parent::a")
-                    print(f"Profile links found: {len(profile_links)} links using selector: //span[@dir='ltr']/parent::a")
+                    logger.debug(f"Profile links found: {len(profile_links)} links using selector: //span[@dir='ltr']/parent::a")
                     
                     for link in profile_links:
                         try:
@@ -254,7 +1634,7 @@ class LinkedInScraper:
                             if profile_url :
                                 # Clean the URL
                                 profile_url = profile_url.split('?')[0]  # Remove URL parameters
-                                print(f"Found profile link: {profile_url}-1")
+                                logger.debug(f"Found profile link: {profile_url}-1")
                                 
                                 # Try to get name from various approaches
                                 name = ""
@@ -271,18 +1651,13 @@ class LinkedInScraper:
                                         # Use part of URL as fallback
                                         name = profile_url.split('/in/')[1].replace('/', '')
                                 
-                                if profile_url and name and profile_url not in [r['profile_url'] for r in page_results]:
-                                    page_results.append({
-                                        'name': name,
-                                        'profile_url': profile_url,
-                                        'linkedin_scraping_dog_info': self.linkedin_scraping_dog(profile_url)
-
-                                    })
+                                if profile_url and name and self._claim_profile(profile_url):
+                                    page_results.append(self._new_record(name, profile_url, profile_url.rstrip('/').split('/')[-1]))
                         except Exception as e:
                             continue
                             
                 except Exception as e:
-                    print(f"Alternative approach also failed: {e}")
+                    logger.warning(f"Alternative approach also failed: {e}")
             else:
                 # Process the containers found with the original approach
                 for container in profile_containers:
@@ -310,16 +1685,15 @@ class LinkedInScraper:
                         if profile_url:
                             profile_url = profile_url.split('?')[0] # Remove URL parameters
                             profile_id = profile_url.split('/')[-1]  # Extract profile ID from URL
-                            print(f"Found profile link: {profile_url}")
-                            print(f"The profile url is {profile_url}")
-                            linkedin_scraping_dog_info = self.linkedin_scraping_dog(profile_id)
+                            logger.debug(f"Found profile link: {profile_url}")
+                            logger.debug(f"The profile url is {profile_url}")
                         
                         # Get name from the link or separate element
                         name = ""
                         try:
                             name_element = container.find_element(By.XPATH, ".//span[contains(@class, 'entity-result__title-text')]/a/span")
                             name = name_element.text.strip()
-                            print(f"Found profile name: {name}")
+                            logger.debug(f"Found profile name: {name}")
                         except:
                             try:
                                 name = container.text.strip()
@@ -328,31 +1702,60 @@ class LinkedInScraper:
                                 if '/in/' in profile_url:
                                     name = profile_url.split('/in/')[1].replace('/', '')
                         
-                        if name and profile_url and profile_url not in [r['profile_url'] for r in page_results]:
-                            page_results.append({
-                                'name': name,
-                                'profile_url': profile_url,
-                                'linkedin_scraping_dog_info': linkedin_scraping_dog_info
-                            })
+                        if name and profile_url and self._claim_profile(profile_url):
+                            # Enrichment runs in the background while we keep navigating
+                            page_results.append(self._new_record(name, profile_url, profile_id))
                             
                     except Exception as e:
                         continue
             
-            print(f"Scraped {len(page_results)} profiles from current page")
+            logger.info(f"Scraped {len(page_results)} profiles from current page")
             return page_results
             
         except Exception as e:
-            print(f"Error scraping profiles: {e}")
+            logger.error(f"Error scraping profiles: {e}")
             return []
 
+    def _claim_profile(self, profile_url, refresh=False):
+        """Return True the first time a profile is seen; duplicates are skipped before any enrichment call"""
+        metrics.incr('profiles_found')
+        if (self.checkpoint is not None and profile_url in self.checkpoint.persisted) \
+                or not self.profile_index.claim(profile_url, refresh):
+            metrics.incr('profiles_deduped')
+            return False
+        return True
+
+    @metrics.timed('enrichment_wait')
+    def resolve_enrichment(self, page_results):
+        """Wait for a page's background enrichment calls and fill in their results"""
+        for record in page_results:
+            if record.future is None:
+                continue
+            try:
+                payload = record.future.result()
+            except Exception as e:
+                logger.warning(f"Enrichment failed for {record.profile_url}: {e}")
+                payload = None
+            record.future = None
+            self._attach_payload(record, payload)
+            metrics.incr('profiles_enriched' if record.enriched else 'profiles_failed')
+        return page_results
+
+    @staticmethod
+    def _attach_payload(record, payload):
+        """Attach an enrichment result to its record"""
+        record.enriched_at = time.time()
+        record.payload = payload
+        record.status = 'failed' if payload is None else 'enriched'
+
     def go_to_next_page(self):
         """Navigate to the next page using URL manipulation with end-page detection"""
         try:
-            print("\n----- Starting Next Page Navigation -----")
+            logger.debug("----- Starting Next Page Navigation -----")
 
             # Get the current URL and check if it contains page parameter
             current_url = self.driver.current_url
-            print(f"Current URL: {current_url}")
+            logger.debug(f"Current URL: {current_url}")
             page=None
             if "page=" in current_url:
                 # Extract current page number
@@ -365,37 +1768,45 @@ class LinkedInScraper:
 
                     # Before navigating, check if we're already on the last page
                     if self._is_last_page():
-                        print(f"Detected last page (page {current_page}). No more results.")
+                        logger.info(f"Detected last page (page {current_page}). No more results.")
                         return False
 
+                    state = self._current_page_state()
+                    self._previous_fingerprint = state['fingerprint'] if state else None
+
                     # Navigate to the next page
-                    print(f"Navigating directly to: {next_url}")
-                    self.driver.get(next_url)
+                    logger.info(f"Navigating directly to: {next_url}")
+                    self._navigate(next_url)
 
-                    # Wait for the page to load
-                    time.sleep(5)
+                    # Wait for the results to render
+                    self._wait_for_results()
 
                     # Verify page changed successfully
                     if self._verify_page_change(current_page, next_page):
-                        print(f"✓ Successfully navigated to page {next_page}")
+                        logger.info(f"✓ Successfully navigated to page {next_page}")
                         return True
                     else:
-                        print(f"× Failed to navigate to page {next_page}")
+                        logger.warning(f"× Failed to navigate to page {next_page}")
                         return False
                 return page
             else:
                 # If URL doesn't contain page parameter, try to find pagination container
-                print("URL doesn't contain page parameter, looking for pagination controls...")
+                logger.info("URL doesn't contain page parameter, looking for pagination controls...")
+
+                # The page state is already known, so a single-page search stops here for free
+                if self._is_last_page():
+                    logger.info("Detected last page (page 1). No more results.")
+                    return False
 
                 # Try to find the Next button and get the URL from its href
                 try:
                     # Save a screenshot for debugging
                     self.driver.save_screenshot("pagination_debug.png")
-                    print("Screenshot saved as pagination_debug.png")
+                    logger.info("Screenshot saved as pagination_debug.png")
 
                     # Try alternative next page methods
                     if self._try_click_next_button():
-                        print("✓ Successfully navigated using button click")
+                        logger.info("✓ Successfully navigated using button click")
                         return True
 
                     # If all else fails, try to append page=2 to the URL
@@ -404,36 +1815,124 @@ class LinkedInScraper:
                     else:
                         next_url = current_url + "?page=2"
 
-                    print(f"Trying first page URL: {next_url}")
-                    self.driver.get(next_url)
-                    time.sleep(5)
+                    logger.info(f"Trying first page URL: {next_url}")
+                    self._navigate(next_url)
+                    self._wait_for_results()
 
                     # Check if the URL change was successful
                     if "page=2" in self.driver.current_url:
-                        print("✓ Successfully navigated to page 2")
+                        logger.info("✓ Successfully navigated to page 2")
                         return True
                     else:
-                        print("× Failed to navigate to page 2")
+                        logger.warning("× Failed to navigate to page 2")
                         return False
                 except Exception as e:
-                    print(f"Error finding alternative pagination: {str(e)}")
+                    logger.error(f"Error finding alternative pagination: {str(e)}")
                     return False
 
         except Exception as e:
-            print(f"Error in go_to_next_page: {str(e)}")
+            logger.error(f"Error in go_to_next_page: {str(e)}")
             self.driver.save_screenshot("error_next_page.png")
             return False
 
+    @staticmethod
+    def _page_url(url, page):
+        """Search URL for the given page number"""
+        if re.search(r'page=\d+', url):
+            return re.sub(r'page=\d+', f'page={page}', url)
+        return url + ("&" if "?" in url else "?") + f"page={page}"
+
+    def _fill_prefetch_window(self, page_num, max_pages=0):
+        """Open the next pages in background tabs so they load while the current page is extracted"""
+        current_handle = self.driver.current_window_handle
+        current_url = self.driver.current_url
+        next_page = self._prefetched[-1][0] + 1 if self._prefetched else page_num + 1
+        while len(self._prefetched) < self.prefetch_window and not (max_pages and next_page > max_pages):
+            self._pace()
+            known_handles = set(self.driver.window_handles)
+            url = self._page_url(current_url, next_page)
+            # Open a blank tab first: CDP resource blocking is per tab and must be in place before the page loads
+            self.driver.execute_script("window.open('about:blank', '_blank');")
+            new_handles = [h for h in self.driver.window_handles if h not in known_handles]
+            if not new_handles:
+                logger.warning("Could not open a prefetch tab, continuing without prefetch")
+                self.prefetch_window = 0
+                break
+            self.driver.switch_to.window(new_handles[0])
+            if self.lightweight:
+                self._block_heavy_resources()
+            # Navigating from a timer lets execute_script return at once, so the tabs load in parallel
+            self.driver.execute_script("var url = arguments[0]; setTimeout(function () { window.location.href = url; }, 0);",
+                                       url)
+            self.driver.switch_to.window(current_handle)
+            self._prefetched.append((next_page, url, new_handles[0]))
+            metrics.incr('pages_prefetched')
+            next_page += 1
+        self.driver.switch_to.window(current_handle)
+
+    def _advance_prefetched(self):
+        """Switch to the next prefetched tab, closing the current one; False once the results run out"""
+        try:
+            if self._is_last_page():
+                self._close_prefetched()
+                return False
+            if not self._prefetched:
+                # Nothing was prefetched (tabs blocked, or the page cap reached), so navigate as usual
+                return self.go_to_next_page()
+            state = self._current_page_state()
+            self._previous_fingerprint = state['fingerprint'] if state else None
+
+            page, url, handle = self._prefetched.popleft()
+            self.driver.close()
+            self.driver.switch_to.window(handle)
+            self._ready_url = None
+            self._page_state = None
+            if not self._wait_for_results():
+                logger.warning(f"Prefetched page {page} did not load: {url}")
+                self._close_prefetched()
+                return False
+
+            state = self._current_page_state()
+            if state is not None and (not state['profiles'] or state['fingerprint'] == self._previous_fingerprint):
+                logger.info(f"Prefetched page {page} has no new results. No more results.")
+                self._close_prefetched()
+                return False
+            logger.info(f"✓ Switched to prefetched page {page}")
+            return True
+        except Exception as e:
+            logger.error(f"Error switching to prefetched page: {str(e)}")
+            return False
+
+    def _close_prefetched(self):
+        """Close every prefetched tab and return focus to the current one"""
+        if not self._prefetched:
+            return
+        current_handle = self.driver.current_window_handle
+        while self._prefetched:
+            _, _, handle = self._prefetched.popleft()
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception as e:
+                logger.debug(f"Could not close prefetch tab: {e}")
+        self.driver.switch_to.window(current_handle)
+
     def _is_last_page(self):
         """Determine if we're on the last page based on multiple indicators"""
         try:
+            # Use the pagination state read together with the profiles; no extra DOM queries needed
+            state = self._current_page_state()
+            if state is not None:
+                return is_last_page(state['pagination'])
+
+            # Fallbacks when the page state could not be read
             # Method 1: Check if the Next button is disabled
             next_buttons = self.driver.find_elements(By.XPATH,
                                                      "//button[contains(@class, 'next') or contains(@aria-label, 'Next')]")
 
             for button in next_buttons:
                 if button.get_attribute("disabled") == "true" or "disabled" in button.get_attribute("class"):
-                    print("Next button is disabled")
+                    logger.info("Next button is disabled")
                     return True
 
             # Method 2: Check for "end of results" message
@@ -447,17 +1946,17 @@ class LinkedInScraper:
 
             for message in end_messages:
                 if self.driver.find_elements(By.XPATH, message):
-                    print("Found 'end of results' message")
+                    logger.info("Found 'end of results' message")
                     return True
 
             # Method 3: Count search results and check if fewer than expected
             try:
                 results = self.driver.find_elements(By.XPATH, "//li[contains(@class, 'search-result')]")
-                print(f"Found {len(results)} results on this page")
+                logger.debug(f"Found {len(results)} results on this page")
 
                 # If less than typical full page (usually 10 or 25), might be last page
                 if 0 < len(results) < 5:  # Adjust threshold as needed
-                    print("Found fewer results than normal, likely last page")
+                    logger.info("Found fewer results than normal, likely last page")
                     return True
             except:
                 pass
@@ -473,14 +1972,14 @@ class LinkedInScraper:
 
             for indicator in last_page_indicators:
                 if indicator in page_source:
-                    print(f"Found '{indicator}' in page source")
+                    logger.info(f"Found '{indicator}' in page source")
                     return True
 
             # Not the last page
             return False
 
         except Exception as e:
-            print(f"Error in _is_last_page: {str(e)}")
+            logger.error(f"Error in _is_last_page: {str(e)}")
             # If we're unsure, assume it's not the last page and try anyway
             return False
 
@@ -490,7 +1989,7 @@ class LinkedInScraper:
             # Method 1: Check URL contains expected page number
             current_url = self.driver.current_url
             if f"page={expected_page}" in current_url:
-                print(f"URL confirms successful page change to page {expected_page}")
+                logger.info(f"URL confirms successful page change to page {expected_page}")
                 return True
 
             # Method 2: Look for page indicator in the UI
@@ -500,32 +1999,24 @@ class LinkedInScraper:
 
                 for indicator in page_indicators:
                     if indicator.text.strip() == str(expected_page):
-                        print(f"UI pagination indicates we're on page {expected_page}")
+                        logger.info(f"UI pagination indicates we're on page {expected_page}")
                         return True
             except:
                 pass
 
-            # Method 3: Check if content has changed by comparing page source hash
-            if hasattr(self, 'previous_page_hash'):
-                import hashlib
-                current_hash = hashlib.md5(self.driver.page_source.encode()).hexdigest()
-                if current_hash != self.previous_page_hash:
-                    print("Page content has changed (hash check)")
-                    self.previous_page_hash = current_hash
-                    return True
-                else:
-                    print("Page content hasn't changed (same hash)")
-                    return False
-            else:
-                # First run, store the hash
-                import hashlib
-                self.previous_page_hash = hashlib.md5(self.driver.page_source.encode()).hexdigest()
+            # Method 3: Check if the result set changed by comparing ordered-profile fingerprints
+            state = self._current_page_state()
+            if state is None or self._previous_fingerprint is None:
+                # Nothing to compare against, assume the navigation worked
                 return True
-
+            if state['fingerprint'] != self._previous_fingerprint:
+                logger.info("Page content has changed (fingerprint check)")
+                return True
+            logger.warning("Page content hasn't changed (same fingerprint)")
             return False
 
         except Exception as e:
-            print(f"Error in _verify_page_change: {str(e)}")
+            logger.error(f"Error in _verify_page_change: {str(e)}")
             return False
 
     def _try_click_next_button(self):
@@ -542,32 +2033,39 @@ class LinkedInScraper:
             for selector in selectors:
                 buttons = self.driver.find_elements(By.XPATH, selector)
                 if buttons:
-                    print(f"Found {len(buttons)} potential Next buttons")
+                    logger.debug(f"Found {len(buttons)} potential Next buttons")
                     for button in buttons:
                         try:
                             # Try to click it
-                            print("Attempting to click button...")
+                            logger.debug("Attempting to click button...")
+                            self._pace()
                             button.click()
-                            time.sleep(3)
 
                             # Check if URL changed
-                            if "page=" in self.driver.current_url:
-                                print("✓ Button click successful")
+                            if self._wait_for_url_page_param():
+                                logger.info("✓ Button click successful")
                                 return True
                         except:
                             # Try JavaScript click
                             try:
                                 self.driver.execute_script("arguments[0].click();", button)
-                                time.sleep(3)
-                                if "page=" in self.driver.current_url:
-                                    print("✓ JavaScript click successful")
+                                if self._wait_for_url_page_param():
+                                    logger.info("✓ JavaScript click successful")
                                     return True
                             except Exception as e:
-                                print(f"Click failed: {str(e)}")
+                                logger.warning(f"Click failed: {str(e)}")
 
             return False
         except Exception as e:
-            print(f"Error in _try_click_next_button: {str(e)}")
+            logger.error(f"Error in _try_click_next_button: {str(e)}")
+            return False
+
+    def _wait_for_url_page_param(self, timeout=5):
+        """Wait for a Next click to put a page parameter in the URL"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(lambda d: "page=" in d.current_url)
+            return True
+        except TimeoutException:
             return False
 
     def _verify_page_changed(self):
@@ -593,129 +2091,305 @@ class LinkedInScraper:
 
             return True
         except Exception as e:
-            print(f"Page verification failed: {str(e)}")
+            logger.warning(f"Page verification failed: {str(e)}")
             return False
     
-    def save_results_to_excel(self, role):
-        """Save scraped results to an Excel file with role and current datetime"""
+    @staticmethod
+    def _clean_role(role):
+        """Clean the role name for filenames (remove special characters)"""
+        clean_role = ''.join(c if c.isalnum() or c in [' ', '_'] else '_' for c in role)
+        return clean_role.replace(' ', '_')
+
+    def _output_path(self, role, extension):
+        """Build an output file path with the role and current datetime in its name"""
+        from datetime import datetime
+        
+        # Format current date and time
+        current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        
+        return os.path.join(self.output_dir, f"linkedin_{self._clean_role(role)}_{current_datetime}.{extension}")
+
+    def _checkpoint_path(self, role):
+        return os.path.join(self.output_dir, f"checkpoint_{self._clean_role(role)}.json")
+
+    def _snapshot_path(self, role):
+        return os.path.join(self.output_dir, f"snapshot_{self._clean_role(role)}.json")
+
+    def _record_snapshot_page(self, page_num, page_results, persisted):
+        """Remember this page's results; profiles that were not stored are retried by the next run.
+
+        New profiles are left out so they stay new, changed ones keep their old entry so they stay changed.
+        """
+        if self.snapshot is None or self._page_records is None:
+            return
+        persisted = set(persisted)
+        new, stale = set(), set()
+        for r in page_results:
+            if r.profile_url not in persisted:
+                (stale if r.refresh else new).add(EnrichmentCache.normalize_key(r.profile_url))
+        self.snapshot.record_page(page_num, self._page_records, exclude=new, stale=stale)
+
+    def open_sinks(self, role):
+        """Open the result sinks listed in result_sinks (mongo, jsonl, raw_jsonl, parquet, excel)"""
+        self.sinks = []
+        for name in self.config.result_sinks:
+            name = name.strip().lower()
+            try:
+                if name == 'mongo':
+                    self.sinks.append(MongoSink(self.mongo_writer))
+                elif name == 'jsonl':
+                    self.sinks.append(JsonlSink(self._output_path(role, 'jsonl')))
+                elif name == 'raw_jsonl':
+                    # Full nested enrichment payloads, for reprocessing
+                    self.sinks.append(JsonlSink(self._output_path(role, 'raw.jsonl'), flatten=False))
+                elif name == 'parquet':
+                    self.sinks.append(ParquetSink(self._output_path(role, 'parquet'),
+                                                  row_group_size=self.config.parquet_row_group_size))
+                elif name == 'excel':
+                    self.sinks.append(ExcelSink(self._output_path(role, 'xlsx')))
+                elif name:
+                    logger.warning(f"Unknown result sink: {name}")
+            except Exception as e:
+                logger.error(f"Error opening {name} sink: {e}")
+        logger.info(f"Streaming results to: {[type(sink).__name__ for sink in self.sinks]}")
+
+    @metrics.timed('persistence')
+    def flush_results(self):
+        """Write the buffered results to every sink and empty the buffer.
+
+        Returns the URLs of enriched profiles that every sink stored; only those may be checkpointed as persisted.
+        Returns None when a sink raised, in which case nothing on the page counts as persisted.
+        """
+        if not self.results:
+            return []
+        # A failed refresh of a changed profile must not overwrite its stored enrichment
+        records = [r for r in self.results if r.enriched or not r.refresh]
+        documents = [record.to_document() for record in records]
+        self._rank(records, documents)
+        failed = set()
+        sink_failed = False
+        for sink in self.sinks:
+            try:
+                failed.update(sink.write(documents) or ())
+            except Exception as e:
+                logger.error(f"Error writing results to {type(sink).__name__}: {e}")
+                sink_failed = True
+        persisted = None if sink_failed else [r.profile_url for r in self.results
+                                              if r.enriched and r.profile_url not in failed]
+        # Profiles whose enrichment or write failed stay eligible for a retry on the next run
+        if persisted:
+            self.profile_index.mark_persisted(persisted)
+        self.total_results += len(self.results)
+        self.results = []
+        return persisted
+
+    def _new_ranker(self, role):
+        """Ranker for role and the skills setting, or None when ranking is off or NumPy is missing"""
+        if not self.config.ranking_enabled:
+            return None
         try:
-            from datetime import datetime
-            
-            # Format current date and time
-            current_datetime = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            
-            # Clean the role name for filename (remove special characters)
-            clean_role = ''.join(c if c.isalnum() or c in [' ', '_'] else '_' for c in role)
-            clean_role = clean_role.replace(' ', '_')
-            
-            # Create filename with role and datetime
-            output_filename = f"linkedin_{clean_role}_{current_datetime}.xlsx"
-            output_path = os.path.join(self.output_dir, output_filename)
-            
-            # Save to Excel
-            self.save_to_mongodb(self.results)
-            print(f"Saving results to {output_path}")
-            df = pd.DataFrame(self.results)
-            df.to_excel(output_path, index=False)
-            print(f"Results saved to {output_path}")
-        except Exception as e:
-            print(f"Error saving results: {e}")
+            import numpy  # noqa: F401
+        except ImportError:
+            logger.warning("NumPy is not installed, results will not be ranked")
+            return None
+        return CandidateRanker(
+            role,
+            skills=self._skills(),
+            locations=self.config.ranking_locations,
+            experience_years=self.config.ranking_experience_years,
+            top_k=self.config.ranking_top_k,
+        )
+
+    def _rank(self, records, documents):
+        """Score a page of result documents and copy the score onto their records"""
+        if self.ranker is None or not documents:
+            return
+        scores = self.ranker.score([flatten_record(document) for document in documents])
+        for record, document, score in zip(records, documents, scores):
+            record.score = document['score'] = round(float(score), 4)
+
+    def export_top_candidates(self, role):
+        """Write the best ranked profiles of the run, highest score first, as JSON lines"""
+        if self.ranker is None or not self.ranker.top_k:
+            return None
+        path = self._output_path(role, f"top{self.ranker.top_k}.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in self.ranker.top():
+                f.write(json.dumps(row, default=str) + "\n")
+        logger.info(f"Top {self.ranker.top_k} candidates saved to {path}")
+        return path
+
+    def close_sinks(self):
+        """Flush any remaining results and close all sinks"""
+        self.flush_results()
+        for sink in self.sinks:
+            try:
+                sink.close()
+                if hasattr(sink, 'path'):
+                    logger.info(f"Results saved to {sink.path}")
+            except Exception as e:
+                logger.error(f"Error closing {type(sink).__name__}: {e}")
+        self.sinks = []
     
-    def run(self):
-        """Run the complete LinkedIn scraping process"""
+    @staticmethod
+    def _credentials(config):
+        """Read the LinkedIn credentials from the config"""
+        username, password = config.username, config.password
+        logger.info(f"Using credentials: {username}")
+        if not username or not password:
+            logger.warning("Username or password not found in environment variables. Exiting...")
+            return None, None
+        return username, password
+
+    def scrape_role(self, role):
+        """Search one role on an already logged-in driver and stream its results to the sinks"""
+        self.total_results = 0
+        self.current_role = role
+        self.ranker = self._new_ranker(role)
+        self.snapshot = SearchSnapshot(self._snapshot_path(role)) if self.config.incremental else None
+        quiet_pages = 0
         try:
-            # Read credentials and role from Excel
-            # print(f"{load_dotenv().get('USERNAME')}")
-            username, password = os.getenv('USERNAME'), os.getenv('PASSWORD')
-            print(f"Using credentials: {username}")
-            if not username or not password:
-                print("Username or password not found in environment variables. Exiting...")
-                return
-            role = os.getenv('role')
-            print(f"Loaded credentials for {username} and searching for role: {role}")
-            
-            # Login to LinkedIn
-            if not self.login(username, password):
-                print("Login failed. Exiting...")
-                self.driver.quit()
-                return
-            
-            # Search for the role and apply people filter
-            if not self.search_role(role):
-                print("Search failed. Exiting...")
-                self.driver.quit()
-                return
-            
+            self.checkpoint = SearchCheckpoint(self._checkpoint_path(role))
+            resume_url = self.checkpoint.resume_url()
             page_num = 1
+            if resume_url:
+                # Skip the search and go straight to the first unfinished page
+                logger.info(f"Resuming search at page {self.checkpoint.last_page + 1}: {resume_url}")
+                self._navigate(resume_url)
+                page_num = self.checkpoint.last_page + 1
+            elif not self.search_role(role):
+                # Search for the role and apply people filter
+                logger.warning("Search failed. Exiting...")
+                return False
+            
+            self.open_sinks(role)
             has_next_page = True
+            # 0 means no page cap
+            max_pages = self.config.max_pages
             
             while has_next_page:
-                print(f"Scraping page {page_num}")
+                logger.info(f"Scraping page {page_num}")
+                self.current_page = page_num
+                if self.prefetch_window:
+                    # Keep the next pages loading in other tabs while this one is extracted
+                    self._fill_prefetch_window(page_num, max_pages)
                 
                 # Scrape profiles on current page
+                self._page_records = None
                 page_results = self.scrape_profiles_on_page()
-                self.results.extend(page_results)
+                page_url = self.driver.current_url
                 
-                # Try to go to next page
-                has_next_page = self.go_to_next_page()
-                #remove these lines in production
-                if page_num < 5:
-                    page_num += 1
+                if self.snapshot is not None and self._page_records is not None:
+                    quiet_pages = 0 if page_results else quiet_pages + 1
+                
+                # Try to go to next page while this page is still being enriched
+                if self.snapshot is not None and quiet_pages >= self.config.incremental_stop_after:
+                    logger.info(f"No new results on the last {quiet_pages} pages, stopping incremental crawl")
+                    has_next_page = False
+                elif self.prefetch_window:
+                    has_next_page = self._advance_prefetched()
                 else:
+                    has_next_page = self.go_to_next_page()
+                self.results.extend(self.resolve_enrichment(page_results))
+                persisted = self.flush_results()
+                if persisted is None:
+                    # Leave the checkpoint on the previous page so a resume scrapes this one again
+                    logger.error(f"Results of page {page_num} were not stored, stopping the search for {role}")
+                    return False
+                self._record_snapshot_page(page_num, page_results, persisted)
+                self.checkpoint.record_page(page_num, page_url, persisted)
+                metrics.incr('pages_scraped')
+                self.export_metrics()
+                if max_pages and page_num >= max_pages:
                     break
+                page_num += 1
             
-            print(f"Total profiles scraped: {len(self.results)}")
+            # The search finished, so the next run should start from scratch
+            self.checkpoint.clear()
+            logger.info(f"Total profiles scraped for {role}: {self.total_results}")
+            logger.info(f"Enrichment cache stats: {self.enrichment_cache.stats()}")
+            logger.info(f"Duplicate profiles skipped so far: {self.profile_index.skipped}")
+            logger.info(f"Search query cache stats: {self.query_cache.stats()}")
+            logger.info(f"Stage timings: {metrics.snapshot()['stages']}")
+            return True
+        finally:
+            # Persist whatever was scraped, even if the search blew up
+            self.close_sinks()
+            self.export_top_candidates(role)
+            if self._prefetched:
+                self._close_prefetched()
+
+    def export_metrics(self):
+        """Refresh the configured metrics exports"""
+        cache_stats = self.enrichment_cache.stats()
+        metrics.set_gauge('enrichment_cache_hits', cache_stats['hits'])
+        metrics.set_gauge('enrichment_cache_misses', cache_stats['misses'])
+        try:
+            metrics.export(self.metrics_path, self.metrics_jsonl_path)
+        except OSError as e:
+            logger.warning(f"Could not export metrics: {e}")
+
+    def close(self):
+        """Release the enrichment pool, HTTP session, Mongo writer (if owned) and browser"""
+        self.export_metrics()
+        self.enrichment_pool.shutdown(wait=False)
+        if self._query_executor is not None:
+            self._query_executor.shutdown(wait=False)
+        self.enrichment_client.close()
+        if self.owns_profile_index:
+            self.profile_index.close()
+        if self.owns_mongo_writer:
+            self.mongo_writer.close()
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
+
+    def run(self, role=None):
+        """Run the complete LinkedIn scraping process"""
+        try:
+            # Read credentials and role from the environment
+            username, password = self._credentials(self.config)
+            if not username:
+                return
+            role = role or self.config.role
+            logger.info(f"Loaded credentials for {username} and searching for role: {role}")
+            # Generate the search query while Chrome starts and logs in
+            self.prefetch_search_query(role)
             
-            # Save results to Excel with role and datetime in filename
-            self.save_results_to_excel(role)
+            # Login to LinkedIn, reusing a saved session when possible
+            if not self.ensure_logged_in(username, password):
+                logger.warning("Login failed. Exiting...")
+                return
+            
+            self.scrape_role(role)
             
         except Exception as e:
-            print(f"An error occurred: {e}")
+            logger.error(f"An error occurred: {e}")
         finally:
             # Close the browser
-            self.driver.quit()
+            self.close()
 
     def linkedin_scraping_dog(self, profile_id):
-         api_key = os.getenv('scraping_dog_api_key')
-        
-
-         url = "https://api.scrapingdog.com/linkedin"
-  
-         params = {
-            "api_key": api_key,
-            "type": "profile",
-            "linkId": profile_id,
-            "private": "false"
-            }
-        
-         response = requests.get(url, params=params)
-  
-         if response.status_code == 200:
-            data = response.json()
-            return data
-         else:
-            return f"Request failed with status code: {response.status_code}"
-
+        """Fetch the Scrapingdog profile for profile_id, returning None if it could not be retrieved"""
+        try:
+            return self.enrichment_client.get_profile(profile_id)
+        except EnrichmentError as e:
+            logger.warning(f"Enrichment failed: {e}")
+            return None
 
-    
     def save_to_mongodb(self, data):
-        DB_NAME = "flexon"
-        COLLECTION_NAME = "jobApplicants"
-        MONGO_URI = os.getenv('MONGODB_URI')
-        client = MongoClient(MONGO_URI)
-        db = client[DB_NAME]
-        collection = db[COLLECTION_NAME]
+        """Upsert one record or a list of records into flexon.jobApplicants"""
         if isinstance(data, list):
             if data:
-                result = collection.insert_many(data)
-                print(f"Inserted {len(result.inserted_ids)} documents into MongoDB.")
+                self.mongo_writer.write(data)
+                self.mongo_writer.flush()
             else:
-                print("No data to insert into MongoDB.")
+                logger.info("No data to insert into MongoDB.")
         else:
-            result = collection.insert_one(data)
-            print(f"Data inserted with ID: {result.inserted_id}")
+            self.mongo_writer.write([data])
+            self.mongo_writer.flush()
 
-    def generate_linkedin_search_string(role: str) -> str:
+    def generate_linkedin_search_string(self, role: str) -> str:
         # Dynamically build the boolean search string parts
         # titles_part = " OR ".join(f'"{title}"' for title in titles)
         # skills_part = " OR ".join(f'"{skill}"' for skill in skills)
@@ -731,8 +2405,8 @@ class LinkedInScraper:
         """
 
         # Call the new OpenAI API syntax
-        response = client.chat.completions.create(
-            model="gpt-4",  # or "gpt-3.5-turbo" if you're using that
+        response = self.openai_client.chat.completions.create(
+            model=SEARCH_QUERY_MODEL,  # or "gpt-3.5-turbo" if you're using that
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that generates LinkedIn boolean search queries."},
                 {"role": "user", "content": prompt}
@@ -743,7 +2417,7 @@ class LinkedInScraper:
         # Extract and return the search string
         return response.choices[0].message.content.strip()
     
-    def normalize_titles_and_generate_query(raw_titles: list, skills: list) -> str:
+    def normalize_titles_and_generate_query(self, raw_titles: list, skills: list) -> str:
         """
         Cleans a messy list of quoted/parenthesized titles and generates a LinkedIn Boolean query.
 
@@ -771,15 +2445,111 @@ class LinkedInScraper:
         
         
 
+def load_roles(path):
+    """Read the role column from a CSV or Excel file"""
+    import pandas as pd
+
+    if path.lower().endswith('.csv'):
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_excel(path)
+    return [str(role).strip() for role in df['role'].dropna() if str(role).strip()]
+
+
+def run_batch(roles, workers=2, excel_path=None):
+    """Scrape many roles over a pool of logged-in scrapers sharing one enrichment cache and Mongo writer"""
+    import queue
+
+    config = get_config()
+    username, password = LinkedInScraper._credentials(config)
+    if not username or not roles:
+        return
+
+    pending = queue.Queue()
+    for role in roles:
+        pending.put(role)
+    workers = max(1, min(workers, len(roles)))
+    logger.info(f"Running {len(roles)} roles on {workers} workers")
+
+    output_dir = os.path.join(os.path.dirname(excel_path or os.path.join(os.getcwd(), 'linkedin_data.xlsx')),
+                              'linkedin_results')
+    os.makedirs(output_dir, exist_ok=True)
+    enrichment_cache = EnrichmentCache.from_config(config, output_dir)
+    mongo_writer = MongoWriter.from_config(config)
+    profile_index = ProfileIndex.from_config(config, output_dir, mongo_writer)
+    query_cache = QueryCache.from_config(config, output_dir)
+
+    user_data_dir = config.chrome_user_data_dir
+
+    def worker(worker_id):
+        # Each worker pays for Chrome startup and login once, then drains the role queue.
+        # Chrome locks its profile directory, so every worker gets its own.
+        scraper = LinkedInScraper(
+            excel_path,
+            enrichment_cache=enrichment_cache,
+            mongo_writer=mongo_writer,
+            profile_index=profile_index,
+            query_cache=query_cache,
+            user_data_dir=os.path.join(user_data_dir, f"worker-{worker_id}") if user_data_dir else None,
+            config=config,
+        )
+        try:
+            try:
+                role = pending.get_nowait()
+            except queue.Empty:
+                return
+            # The first role's search query is generated while this worker's Chrome starts and logs in
+            scraper.prefetch_search_query(role)
+            if not scraper.ensure_logged_in(username, password):
+                # Hand the role back so a worker that did log in can still scrape it
+                pending.put(role)
+                logger.warning(f"Login failed. Worker exiting, role {role} returned to the queue...")
+                return
+            while True:
+                try:
+                    scraper.scrape_role(role)
+                except Exception as e:
+                    logger.error(f"Error scraping role {role}: {e}")
+                try:
+                    role = pending.get_nowait()
+                except queue.Empty:
+                    return
+        finally:
+            scraper.close()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+        for future in [executor.submit(worker, worker_id) for worker_id in range(workers)]:
+            try:
+                future.result()
+            except BaseException as e:
+                logger.error(f"Worker failed: {e}")
+
+    unscraped = []
+    while not pending.empty():
+        unscraped.append(pending.get_nowait())
+    if unscraped:
+        logger.warning(f"No logged-in worker left for roles: {unscraped}")
+
+    profile_index.close()
+    mongo_writer.close()
+    logger.info(f"Batch finished. Enrichment cache stats: {enrichment_cache.stats()}")
+    enrichment_cache.close()
+
+
 if __name__ == "__main__":
+    config = get_config()
+    logging.basicConfig(
+        level=config.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(threadName)s %(message)s",
+    )
     # Define the specific Excel file path
     excel_path = r"C:\Users\navee\OneDrive\Desktop\LinkedinScrap\linkedin_data.xlsx"
-    print(f"Using Excel file at: {excel_path}")
+    logger.info(f"Using Excel file at: {excel_path}")
     
     # Check if file exists at the specified location
     if not os.path.exists(excel_path):
         # Create sample Excel file if it doesn't exist
-        print(f"File not found at {excel_path}. Creating sample Excel file...")
+        logger.warning(f"File not found at {excel_path}. Creating sample Excel file...")
         
         # Ensure directory exists
         os.makedirs(os.path.dirname(excel_path), exist_ok=True)
@@ -790,11 +2560,16 @@ if __name__ == "__main__":
             'password': ['your_password'],
             'role': ['Software Engineer']
         }
+        import pandas as pd
         pd.DataFrame(sample_data).to_excel(excel_path, index=False)
-        print(f"Sample file created at {excel_path}")
-        print("Please update the file with your actual credentials and desired role before running again.")
+        logger.info(f"Sample file created at {excel_path}")
+        logger.info("Please update the file with your actual credentials and desired role before running again.")
         exit(0)
     
-    # Run the scraper with the specified Excel path
-    scraper = LinkedInScraper(excel_path)
-    scraper.run()
+    if config.batch_workers:
+        # Batch mode: scrape every role in the file over a pool of browser sessions
+        run_batch(load_roles(config.roles_path or excel_path), workers=config.batch_workers, excel_path=excel_path)
+    else:
+        # Run the scraper with the specified Excel path
+        scraper = LinkedInScraper(excel_path, config=config)
+        scraper.run()